@@ -1,6 +1,7 @@
 """Database package initialization."""
 
-from app.database.postgresql import PostgreSQL, get_db, create_session
+from app.database.postgresql import PostgreSQL, get_db, get_db_readonly, create_session
+from app.database.mongodb import MongoDB, Collections
 # Neo4j is optional - uncomment if you want to use it
 # from app.database.neo4j_client import Neo4jClient, get_neo4j
 from app.database.models import (
@@ -23,7 +24,11 @@ __all__ = [
     # PostgreSQL
     "PostgreSQL",
     "get_db",
+    "get_db_readonly",
     "create_session",
+    # MongoDB (driver imported on connect)
+    "MongoDB",
+    "Collections",
     # Neo4j (optional)
     # "Neo4jClient",
     # "get_neo4j",
@@ -4,15 +4,89 @@ Defines all database tables using SQLAlchemy 2.0 declarative syntax.
 """
 
 from sqlalchemy import (
-    String, Integer, Boolean, Numeric, Text, DateTime, Date,
-    ForeignKey, Index, func
+    String, CHAR, Integer, Boolean, Float, Text, DateTime, Date,
+    ForeignKey, Index, func, text
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import UUID, JSONB, BYTEA, ARRAY
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
-from typing import Optional, List
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, List, Any
+import os
+import time
 import uuid
 
+import orjson
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+    
+    Keys sort by creation time, so inserts append to the right edge of the
+    primary key index instead of touching random pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+@lru_cache(maxsize=8192)
+def resolve_user_uuid(user_id: str) -> uuid.UUID:
+    """
+    Map an external user id to its UUID key.
+    
+    UUID strings parse as-is; anything else (e.g. "demo_user") gets a
+    deterministic uuid5. Cached, so repeat callers skip the parse and the
+    exception on the non-UUID path.
+    """
+    try:
+        return uuid.UUID(user_id)
+    except ValueError:
+        return uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
+
+
+# Numpy scalars/arrays (model scores) and non-str dict keys were accepted by
+# the stdlib json encoder these payloads used to go through
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(value: Any) -> Any:
+    """Convert values orjson can't serialize natively, or raise TypeError."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # Remaining numpy types (e.g. float16) and other array-likes
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class CompactJSON(TypeDecorator):
+    """
+    JSON payload stored as orjson-encoded BYTEA.
+    
+    Use for opaque blobs the app only passes through; keep JSONB for
+    columns that are queried with JSON operators.
+    """
+    impl = BYTEA
+    cache_ok = True
+    
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return orjson.dumps(value, default=orjson_default, option=ORJSON_OPTIONS)
+    
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+        return orjson.loads(value)
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
@@ -23,7 +97,7 @@ class User(Base):
     """User account model."""
     __tablename__ = "users"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -35,25 +109,28 @@ class User(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    resumes: Mapped[List["Resume"]] = relationship("Resume", back_populates="user", cascade="all, delete-orphan")
-    readiness_scores: Mapped[List["ReadinessScore"]] = relationship("ReadinessScore", back_populates="user", cascade="all, delete-orphan")
-    assessments: Mapped[List["Assessment"]] = relationship("Assessment", back_populates="user", cascade="all, delete-orphan")
-    assessment_results: Mapped[List["AssessmentResult"]] = relationship("AssessmentResult", back_populates="user", cascade="all, delete-orphan")
-    learning_plans: Mapped[List["LearningPlan"]] = relationship("LearningPlan", back_populates="user", cascade="all, delete-orphan")
-    learning_progress: Mapped[List["LearningProgress"]] = relationship("LearningProgress", back_populates="user", cascade="all, delete-orphan")
-    predictions: Mapped[List["Prediction"]] = relationship("Prediction", back_populates="user", cascade="all, delete-orphan")
-    conversations: Mapped[List["Conversation"]] = relationship("Conversation", back_populates="user", cascade="all, delete-orphan")
+    # Collections raise on lazy access; load them explicitly with
+    # select(User).options(selectinload(User.resumes)) to avoid N+1 queries.
+    resumes: Mapped[List["Resume"]] = relationship("Resume", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    readiness_scores: Mapped[List["ReadinessScore"]] = relationship("ReadinessScore", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    assessments: Mapped[List["Assessment"]] = relationship("Assessment", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    assessment_results: Mapped[List["AssessmentResult"]] = relationship("AssessmentResult", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    learning_plans: Mapped[List["LearningPlan"]] = relationship("LearningPlan", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    learning_progress: Mapped[List["LearningProgress"]] = relationship("LearningProgress", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    predictions: Mapped[List["Prediction"]] = relationship("Prediction", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    conversations: Mapped[List["Conversation"]] = relationship("Conversation", back_populates="user", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
 
 
 class Resume(Base):
     """Resume file and parsed data model."""
     __tablename__ = "resumes"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    filename: Mapped[str] = mapped_column(String(255), nullable=False)
-    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    filename: Mapped[str] = mapped_column(Text, nullable=False)
+    file_path: Mapped[str] = mapped_column(Text, nullable=False)
     parsed_data: Mapped[Optional[dict]] = mapped_column(JSONB)
+    content_sha256: Mapped[Optional[str]] = mapped_column(CHAR(64))
     uploaded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -63,8 +140,9 @@ class Resume(Base):
     predictions: Mapped[List["Prediction"]] = relationship("Prediction", back_populates="resume")
     
     __table_args__ = (
-        Index("idx_resumes_user_id", "user_id"),
+        Index("idx_resumes_user_uploaded", "user_id", text("uploaded_at DESC")),
         Index("idx_resumes_uploaded_at", "uploaded_at"),
+        Index("idx_resumes_user_sha256", "user_id", "content_sha256", unique=True),
     )
 
 
@@ -72,19 +150,19 @@ class ReadinessScore(Base):
     """Career readiness score model."""
     __tablename__ = "readiness_scores"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     resume_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="SET NULL"))
-    target_role: Mapped[str] = mapped_column(String(255), nullable=False)
-    overall_score: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
-    technical_skills_score: Mapped[Optional[float]] = mapped_column(Numeric(5, 2))
-    experience_score: Mapped[Optional[float]] = mapped_column(Numeric(5, 2))
-    project_score: Mapped[Optional[float]] = mapped_column(Numeric(5, 2))
-    tool_score: Mapped[Optional[float]] = mapped_column(Numeric(5, 2))
+    target_role: Mapped[str] = mapped_column(Text, nullable=False)
+    overall_score: Mapped[float] = mapped_column(Float, nullable=False)
+    technical_skills_score: Mapped[Optional[float]] = mapped_column(Float)
+    experience_score: Mapped[Optional[float]] = mapped_column(Float)
+    project_score: Mapped[Optional[float]] = mapped_column(Float)
+    tool_score: Mapped[Optional[float]] = mapped_column(Float)
     explanation: Mapped[Optional[str]] = mapped_column(Text)
-    strengths: Mapped[Optional[dict]] = mapped_column(JSONB)
-    weaknesses: Mapped[Optional[dict]] = mapped_column(JSONB)
-    recommendations: Mapped[Optional[dict]] = mapped_column(JSONB)
+    strengths: Mapped[Optional[List[str]]] = mapped_column(ARRAY(Text))
+    weaknesses: Mapped[Optional[List[str]]] = mapped_column(ARRAY(Text))
+    recommendations: Mapped[Optional[List[str]]] = mapped_column(ARRAY(Text))
     factors: Mapped[Optional[dict]] = mapped_column(JSONB)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     
@@ -93,8 +171,8 @@ class ReadinessScore(Base):
     resume: Mapped[Optional["Resume"]] = relationship("Resume", back_populates="readiness_scores")
     
     __table_args__ = (
-        Index("idx_readiness_scores_user_id", "user_id"),
-        Index("idx_readiness_scores_created_at", "created_at"),
+        Index("idx_readiness_user_created", "user_id", text("created_at DESC")),
+        Index("idx_readiness_weak_gin", "weaknesses", postgresql_using="gin"),
     )
 
 
@@ -102,11 +180,11 @@ class Assessment(Base):
     """Skill assessment model."""
     __tablename__ = "assessments"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     skill: Mapped[str] = mapped_column(String(100), nullable=False)
     difficulty: Mapped[str] = mapped_column(String(50), nullable=False)
-    questions: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    questions: Mapped[dict] = mapped_column(CompactJSON, nullable=False)
     total_points: Mapped[int] = mapped_column(Integer, nullable=False)
     time_limit_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -125,13 +203,13 @@ class AssessmentResult(Base):
     """Assessment result model."""
     __tablename__ = "assessment_results"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     assessment_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("assessments.id", ondelete="CASCADE"), nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    answers: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    answers: Mapped[dict] = mapped_column(CompactJSON, nullable=False)
     score: Mapped[int] = mapped_column(Integer, nullable=False)
     max_score: Mapped[int] = mapped_column(Integer, nullable=False)
-    percentage: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
+    percentage: Mapped[float] = mapped_column(Float, nullable=False)
     confidence_level: Mapped[str] = mapped_column(String(50), nullable=False)
     passed: Mapped[bool] = mapped_column(Boolean, nullable=False)
     feedback: Mapped[Optional[dict]] = mapped_column(JSONB)
@@ -151,12 +229,12 @@ class LearningPlan(Base):
     """Learning plan model."""
     __tablename__ = "learning_plans"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    target_role: Mapped[str] = mapped_column(String(255), nullable=False)
+    target_role: Mapped[str] = mapped_column(Text, nullable=False)
     current_skills: Mapped[dict] = mapped_column(JSONB, nullable=False)
     target_skills: Mapped[dict] = mapped_column(JSONB, nullable=False)
-    learning_path: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    learning_path: Mapped[dict] = mapped_column(CompactJSON, nullable=False)
     estimated_weeks: Mapped[Optional[int]] = mapped_column(Integer)
     status: Mapped[str] = mapped_column(String(50), default="active")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -176,7 +254,7 @@ class LearningProgress(Base):
     """Learning progress tracking model."""
     __tablename__ = "learning_progress"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     learning_plan_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("learning_plans.id", ondelete="CASCADE"))
     skill: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -201,10 +279,10 @@ class JobListing(Base):
     """Job listing model (cached from external APIs)."""
     __tablename__ = "job_listings"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    title: Mapped[str] = mapped_column(String(255), nullable=False)
-    company: Mapped[str] = mapped_column(String(255), nullable=False)
-    location: Mapped[Optional[str]] = mapped_column(String(255))
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    company: Mapped[str] = mapped_column(Text, nullable=False)
+    location: Mapped[Optional[str]] = mapped_column(Text)
     description: Mapped[Optional[str]] = mapped_column(Text)
     required_skills: Mapped[Optional[dict]] = mapped_column(JSONB)
     salary_range: Mapped[Optional[str]] = mapped_column(String(100))
@@ -213,11 +291,14 @@ class JobListing(Base):
     source: Mapped[Optional[str]] = mapped_column(String(100))
     external_url: Mapped[Optional[str]] = mapped_column(Text)
     posted_date: Mapped[Optional[datetime]] = mapped_column(Date)
-    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Partition key must be part of the primary key on partitioned tables
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     
     __table_args__ = (
         Index("idx_job_listings_posted_date", "posted_date"),
         Index("idx_job_listings_location", "location"),
+        Index("idx_job_listings_fetched_brin", "fetched_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (fetched_at)"},
     )
 
 
@@ -225,13 +306,13 @@ class Prediction(Base):
     """Shortlisting probability prediction model."""
     __tablename__ = "predictions"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     resume_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("resumes.id", ondelete="SET NULL"))
     job_description: Mapped[str] = mapped_column(Text, nullable=False)
-    shortlist_probability: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
+    shortlist_probability: Mapped[float] = mapped_column(Float, nullable=False)
     confidence: Mapped[str] = mapped_column(String(50), nullable=False)
-    factors: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    factors: Mapped[dict] = mapped_column(CompactJSON, nullable=False)
     recommendations: Mapped[Optional[dict]] = mapped_column(JSONB)
     predicted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     
@@ -240,8 +321,7 @@ class Prediction(Base):
     resume: Mapped[Optional["Resume"]] = relationship("Resume", back_populates="predictions")
     
     __table_args__ = (
-        Index("idx_predictions_user_id", "user_id"),
-        Index("idx_predictions_predicted_at", "predicted_at"),
+        Index("idx_predictions_user_predicted", "user_id", text("predicted_at DESC")),
     )
 
 
@@ -249,20 +329,23 @@ class Conversation(Base):
     """AI agent conversation history model."""
     __tablename__ = "conversations"
     
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     session_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     role: Mapped[str] = mapped_column(String(50), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     conversation_metadata: Mapped[Optional[dict]] = mapped_column(JSONB)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Partition key must be part of the primary key on partitioned tables
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="conversations")
     
     __table_args__ = (
-        Index("idx_conversations_user_id", "user_id"),
-        Index("idx_conversations_session_id", "session_id"),
+        Index("idx_conversations_user_created", "user_id", text("created_at DESC")),
+        Index("idx_conversations_session_created", "session_id", "created_at"),
+        Index("idx_conversations_created_brin", "created_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
 
@@ -3,11 +3,13 @@ MongoDB database client and connection management.
 Provides async MongoDB operations using Motor.
 """
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 import logging
 
-from app.config import settings
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +17,27 @@ logger = logging.getLogger(__name__)
 class MongoDB:
     """MongoDB connection manager."""
     
-    client: Optional[AsyncIOMotorClient] = None
-    db: Optional[AsyncIOMotorDatabase] = None
+    client: Optional["AsyncIOMotorClient"] = None
+    db: Optional["AsyncIOMotorDatabase"] = None
     
     @classmethod
     async def connect(cls):
         """Establish connection to MongoDB."""
+        # Imported lazily so workers that never use MongoDB skip the driver import
+        from motor.motor_asyncio import AsyncIOMotorClient
+        
+        # One client (and connection pool) per process, shared by every service
+        if cls.client is not None:
+            return
+        
+        settings = get_settings()
         try:
-            cls.client = AsyncIOMotorClient(settings.mongodb_uri)
+            cls.client = AsyncIOMotorClient(
+                settings.mongodb_uri,
+                maxPoolSize=settings.mongodb_max_pool_size,
+                minPoolSize=settings.mongodb_min_pool_size,
+                maxIdleTimeMS=30000
+            )
             cls.db = cls.client[settings.mongodb_db_name]
             
             # Test connection
@@ -31,17 +46,55 @@ class MongoDB:
             
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
+            # Leave no half-initialized client behind so connect() can retry
+            if cls.client is not None:
+                cls.client.close()
+            cls.client = None
+            cls.db = None
             raise
+        
+        await cls.ensure_indexes()
+    
+    @classmethod
+    async def ensure_indexes(cls):
+        """Create indexes the services rely on (no-op when they exist)."""
+        from pymongo import ASCENDING, DESCENDING, IndexModel
+        
+        indexes = {
+            # Conversations are upserted and read by user_id, one per user
+            Collections.CONVERSATIONS: [
+                IndexModel([("user_id", ASCENDING)], name="user_id", unique=True),
+            ],
+            Collections.RESUMES: [
+                IndexModel([("resume_id", ASCENDING)], name="resume_id", unique=True),
+                IndexModel([("user_id", ASCENDING), ("uploaded_at", DESCENDING)], name="user_uploaded_at"),
+                # One stored copy per user and file content; documents from
+                # before content hashing have no content_sha256 and are left out
+                IndexModel(
+                    [("user_id", ASCENDING), ("content_sha256", ASCENDING)],
+                    name="user_content_sha256",
+                    unique=True,
+                    partialFilterExpression={"content_sha256": {"$exists": True}}
+                ),
+            ],
+        }
+        for collection, models in indexes.items():
+            try:
+                await cls.db[collection].create_indexes(models)
+            except Exception as e:
+                logger.warning(f"Failed to create MongoDB indexes on {collection}: {e}")
     
     @classmethod
     async def disconnect(cls):
         """Close MongoDB connection."""
         if cls.client:
             cls.client.close()
+            cls.client = None
+            cls.db = None
             logger.info("Disconnected from MongoDB")
     
     @classmethod
-    def get_database(cls) -> AsyncIOMotorDatabase:
+    def get_database(cls) -> "AsyncIOMotorDatabase":
         """Get database instance."""
         if cls.db is None:
             raise RuntimeError("Database not initialized. Call connect() first.")
@@ -58,6 +111,7 @@ class Collections:
     """MongoDB collection names."""
     USERS = "users"
     RESUMES = "resumes"
+    CONVERSATIONS = "conversations"
     READINESS_SCORES = "readiness_scores"
     LEARNING_PLANS = "learning_plans"
     LEARNING_PROGRESS = "learning_progress"
@@ -67,6 +121,6 @@ class Collections:
 
 
 # Dependency for FastAPI
-async def get_db() -> AsyncIOMotorDatabase:
+async def get_db() -> "AsyncIOMotorDatabase":
     """FastAPI dependency to get database instance."""
     return MongoDB.get_database()
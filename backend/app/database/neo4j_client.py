@@ -3,11 +3,13 @@ Neo4j database client and connection management.
 Provides graph database operations for skill ontology.
 """
 
-from neo4j import AsyncGraphDatabase, AsyncDriver
-from typing import Optional, Any
+from typing import Optional, Any, AsyncIterator, TYPE_CHECKING
 import logging
 
-from app.config import settings
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    from neo4j import AsyncDriver
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +17,15 @@ logger = logging.getLogger(__name__)
 class Neo4jClient:
     """Neo4j connection manager."""
     
-    driver: Optional[AsyncDriver] = None
+    driver: Optional["AsyncDriver"] = None
     
     @classmethod
     async def connect(cls):
         """Establish connection to Neo4j."""
+        # Imported lazily so workers that never use Neo4j skip the driver import
+        from neo4j import AsyncGraphDatabase
+        
+        settings = get_settings()
         try:
             cls.driver = AsyncGraphDatabase.driver(
                 settings.neo4j_uri,
@@ -45,7 +51,7 @@ class Neo4jClient:
             logger.info("Disconnected from Neo4j")
     
     @classmethod
-    def get_driver(cls) -> AsyncDriver:
+    def get_driver(cls) -> "AsyncDriver":
         """Get driver instance."""
         if cls.driver is None:
             raise RuntimeError("Neo4j driver not initialized. Call connect() first.")
@@ -58,6 +64,14 @@ class Neo4jClient:
             result = await session.run(query, parameters or {})
             return [record.data() async for record in result]
     
+    @classmethod
+    async def stream_query(cls, query: str, parameters: dict = None) -> AsyncIterator[dict]:
+        """Execute a Cypher query and yield records as they arrive."""
+        async with cls.driver.session(fetch_size=1000) as session:
+            result = await session.run(query, parameters or {})
+            async for record in result:
+                yield record.data()
+    
     @classmethod
     async def execute_write(cls, query: str, parameters: dict = None) -> Any:
         """Execute a write transaction."""
@@ -68,6 +82,6 @@ class Neo4jClient:
 
 
 # Dependency for FastAPI
-async def get_neo4j() -> AsyncDriver:
+async def get_neo4j() -> "AsyncDriver":
     """FastAPI dependency to get Neo4j driver."""
     return Neo4jClient.get_driver()
@@ -4,19 +4,57 @@ Provides async SQLAlchemy engine and session factory.
 """
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
-from sqlalchemy import text
-from typing import AsyncGenerator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy import text, insert, event
+from sqlalchemy.orm import Session
+from typing import AsyncGenerator, Any
+from datetime import date
+import asyncio
 import logging
 
-from app.config import settings
-from app.database.models import Base
+import orjson
+
+from app.config import get_settings
+from app.database.models import Base, ORJSON_OPTIONS, orjson_default
 
 logger = logging.getLogger(__name__)
 
 
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_writes(session, flush_context):
+    """Record that the current transaction has written rows."""
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    """Conservatively treat any non-SELECT statement (including raw SQL) as a write."""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset_writes(session, transaction):
+    """Clear the write marker once the outermost transaction ends."""
+    if transaction.parent is None:
+        session.info.pop("has_writes", None)
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON/JSONB bind parameters with orjson."""
+    return orjson.dumps(value, default=orjson_default, option=ORJSON_OPTIONS).decode()
+
+
 class PostgreSQL:
-    """PostgreSQL connection manager."""
+    """
+    PostgreSQL connection manager.
+    
+    asyncpg keeps a per-connection prepared statement cache, so pooled
+    connections skip parse/plan for repeated queries. Behind pgbouncer in
+    transaction mode prepared statements cannot be reused across server
+    connections; set DATABASE_STATEMENT_CACHE_SIZE=0 there, which disables
+    both caches and leaves SQLAlchemy's compiled SQL cache in effect.
+    """
     
     engine = None
     async_session_factory = None
@@ -24,15 +62,39 @@ class PostgreSQL:
     @classmethod
     async def connect(cls):
         """Initialize database engine and session factory."""
+        settings = get_settings()
+        
         try:
             # Create async engine
+            if settings.is_test:
+                pool_kwargs = {"poolclass": NullPool}
+            else:
+                pool_kwargs = {
+                    "poolclass": AsyncAdaptedQueuePool,
+                    "pool_size": settings.database_pool_size,
+                    "max_overflow": settings.database_max_overflow,
+                    "pool_timeout": 30,
+                    "pool_recycle": 1800,  # Recycle before server/proxy idle timeouts
+                }
+            
+            statement_cache_size = settings.database_statement_cache_size
+            connect_args = {
+                "statement_cache_size": statement_cache_size,
+                "prepared_statement_cache_size": min(statement_cache_size, 256),
+                # Short OLTP queries never benefit from JIT compilation
+                "server_settings": {"jit": "off"},
+            }
+            
             cls.engine = create_async_engine(
                 settings.database_url,
-                echo=settings.debug,
-                poolclass=NullPool if settings.environment == "test" else None,
+                echo=False,  # SQL logging is controlled via the sqlalchemy.engine logger
                 pool_pre_ping=True,  # Verify connections before using
-                pool_size=5,
-                max_overflow=10,
+                insertmanyvalues_page_size=1000,  # Rows per batched INSERT ... VALUES
+                connect_args=connect_args,
+                # orjson for the asyncpg JSON/JSONB codecs SQLAlchemy registers per connection
+                json_serializer=_json_serializer,
+                json_deserializer=orjson.loads,
+                **pool_kwargs,
             )
             
             # Create session factory
@@ -44,9 +106,9 @@ class PostgreSQL:
                 autoflush=False,
             )
             
-            # Test connection
-            async with cls.engine.begin() as conn:
-                await conn.execute(text("SELECT 1"))
+            # Test connection and pre-open the pool so the first requests
+            # don't each pay a full connect + auth handshake
+            await cls._warm_pool(1 if settings.is_test else settings.database_pool_size)
             
             logger.info("Connected to PostgreSQL database")
             
@@ -54,6 +116,22 @@ class PostgreSQL:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             raise
     
+    @classmethod
+    async def _warm_pool(cls, size: int):
+        """Open ``size`` connections concurrently, run SELECT 1, and return them to the pool."""
+        results = await asyncio.gather(
+            *(cls.engine.connect() for _ in range(size)),
+            return_exceptions=True,
+        )
+        connections = [r for r in results if not isinstance(r, BaseException)]
+        try:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+        finally:
+            await asyncio.gather(*(conn.close() for conn in connections))
+    
     @classmethod
     async def disconnect(cls):
         """Close database connections."""
@@ -70,8 +148,77 @@ class PostgreSQL:
         async with cls.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         
+        await cls.ensure_partitions()
+        
         logger.info("Created all database tables")
     
+    @classmethod
+    async def ensure_partitions(cls, months_ahead: int = 3):
+        """
+        Create monthly range partitions for time-partitioned tables.
+        
+        Covers the current month plus ``months_ahead`` future months, and a
+        DEFAULT partition so inserts never fail if this has not run recently.
+        Rows that already landed in DEFAULT for a month being created are
+        moved into the new partition. Safe to call repeatedly and from
+        several workers at once (e.g. on startup and from a scheduled job).
+        """
+        if not cls.engine:
+            raise RuntimeError("Database not initialized. Call connect() first.")
+        
+        # table name -> partition key column, from "RANGE (<column>)"
+        partitioned = {
+            table.name: partition_by.split("(", 1)[1].rstrip(")").strip()
+            for table in Base.metadata.sorted_tables
+            if (partition_by := table.dialect_options["postgresql"].get("partition_by"))
+        }
+        
+        today = date.today()
+        months = []
+        for offset in range(months_ahead + 1):
+            year, month = divmod(today.month - 1 + offset, 12)
+            start = date(today.year + year, month + 1, 1)
+            year, month = divmod(start.month, 12)
+            end = date(start.year + year, month + 1, 1)
+            months.append((start, end))
+        
+        async with cls.engine.begin() as conn:
+            # Serialize concurrent callers; released at commit
+            await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('skilllens_partitions'))"))
+            
+            for table, key in partitioned.items():
+                default = f"{table}_default"
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {table} DEFAULT"
+                ))
+                
+                for start, end in months:
+                    partition = f"{table}_{start:%Y%m}"
+                    if await conn.scalar(text("SELECT to_regclass(:name)"), {"name": partition}):
+                        continue
+                    
+                    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    in_range = f"{key} >= '{start.isoformat()}' AND {key} < '{end.isoformat()}'"
+                    stranded = await conn.scalar(text(
+                        f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"
+                    ))
+                    if not stranded:
+                        await conn.execute(text(f"CREATE TABLE {partition} PARTITION OF {table} {bounds}"))
+                        continue
+                    
+                    # Postgres rejects a partition whose range overlaps rows in
+                    # DEFAULT, so detach DEFAULT, create the partition and move them
+                    await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+                    await conn.execute(text(f"CREATE TABLE {partition} PARTITION OF {table} {bounds}"))
+                    await conn.execute(text(
+                        f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+                        f"INSERT INTO {table} SELECT * FROM moved"
+                    ))
+                    await conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+                    logger.warning(f"Moved {start:%Y-%m} rows of {table} out of the DEFAULT partition")
+        
+        logger.info(f"Ensured partitions for {', '.join(partitioned)} through {months[-1][0]:%Y-%m}")
+    
     @classmethod
     async def drop_tables(cls):
         """Drop all tables (for testing)."""
@@ -83,6 +230,22 @@ class PostgreSQL:
         
         logger.info("Dropped all database tables")
     
+    @classmethod
+    async def bulk_insert(cls, model: type[Base], rows: list[dict[str, Any]]) -> None:
+        """
+        Insert many rows in batched round trips.
+        
+        Intended for append-heavy tables such as Conversation and
+        LearningProgress, where rows arrive in groups.
+        """
+        if not rows:
+            return
+        
+        session_factory = cls.get_session_factory()
+        async with session_factory() as session:
+            async with session.begin():
+                await session.execute(insert(model), rows)
+    
     @classmethod
     def get_session_factory(cls) -> async_sessionmaker:
         """Get session factory."""
@@ -107,7 +270,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with session_factory() as session:
         try:
             yield session
-            await session.commit()
+            # Skip the COMMIT round trip when nothing was written
+            if session.in_transaction() and (
+                session.info.get("has_writes") or session.new or session.dirty or session.deleted
+            ):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -115,6 +282,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_db_readonly() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for read-only endpoints.
+    
+    Runs the request in a READ ONLY transaction that is rolled back at the
+    end, so Postgres never assigns a transaction ID or writes a commit record.
+    """
+    session_factory = PostgreSQL.get_session_factory()
+    async with session_factory() as session:
+        try:
+            await session.execute(text("SET TRANSACTION READ ONLY"))
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
 # Convenience function for manual session creation
 async def create_session() -> AsyncSession:
     """Create a new database session manually."""
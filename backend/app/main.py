@@ -3,37 +3,97 @@ SkillLens FastAPI Application
 Main entry point for the backend API.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+import asyncio
+import atexit
 import logging
+import queue
+import sys
+import orjson
+
+from app.config import settings, ensure_dirs
+from app.middleware.health import HealthShortCircuitMiddleware
+
+# Configure logging. Records go through a queue so formatting and stderr
+# writes happen on the listener thread instead of the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-from app.config import settings
+# The queue handler only merges args (and tracebacks) into the message;
+# the listener's handler applies the real format
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
 
-# Configure logging
 logging.basicConfig(
-    level=getattr(logging, settings.log_level),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    level=logging.getLevelNamesMapping().get(settings.log_level.upper(), logging.INFO),
+    handlers=[_log_queue_handler],
+    force=True
 )
+
+# SQL statement logging in debug mode (instead of engine echo)
+logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if settings.debug else logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+PARTITION_MAINTENANCE_INTERVAL = 24 * 60 * 60  # seconds
+
+
+async def _maintain_partitions():
+    """Keep upcoming monthly partitions created while the process runs."""
+    from app.database import PostgreSQL
+    
+    while True:
+        await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL)
+        try:
+            await PostgreSQL.ensure_partitions()
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     logger.info("Starting SkillLens backend...")
     
+    # The loop is chosen by the server (uvicorn --loop); only report it here
+    loop_module = type(asyncio.get_running_loop()).__module__
+    if loop_module.startswith("uvloop"):
+        logger.info("uvloop event loop enabled")
+    elif sys.platform != "win32":
+        logger.warning("Running on the default asyncio event loop. Start uvicorn with --loop uvloop for better throughput.")
+    
+    # Ensure upload directory exists
+    ensure_dirs()
+    
     # Connect to PostgreSQL database
     from app.database import PostgreSQL
     
     await PostgreSQL.connect()
     logger.info("Connected to PostgreSQL database")
     
-    # Create tables if they don't exist (development only)
-    if settings.environment == "development":
+    # Create tables if they don't exist (development only; this also
+    # creates partitions). Elsewhere monthly partitions must still exist
+    # before their month starts, or its rows pile up in DEFAULT.
+    if settings.is_development:
         await PostgreSQL.create_tables()
         logger.info("Database tables created/verified")
+    else:
+        try:
+            await PostgreSQL.ensure_partitions()
+        except Exception as e:
+            logger.error(f"Could not create table partitions (is the database migrated?): {e}")
+    partition_task = asyncio.create_task(_maintain_partitions())
     
     # Validate API keys
     api_key_status = settings.validate_api_keys()
@@ -41,15 +101,28 @@ async def lifespan(app: FastAPI):
     
     if not all(api_key_status.values()):
         logger.warning("Some API keys are missing. Check .env file.")
-    
+
+    # Build request-path service singletons now rather than on first request
+    from app.services.auth_service import get_auth_service
+    from app.services.institutional_analytics import get_analytics_service
+    get_auth_service()
+    get_analytics_service()
+
     logger.info("SkillLens backend started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down SkillLens backend...")
+    partition_task.cancel()
     await PostgreSQL.disconnect()
     logger.info("Disconnected from PostgreSQL database")
+    
+    from app.services.response_cache import get_response_cache
+    await get_response_cache().close()
+    
+    from app.services.cpu_pool import shutdown_cpu_pool
+    shutdown_cpu_pool()
     logger.info("SkillLens backend shut down successfully")
 
 
@@ -59,39 +132,48 @@ app = FastAPI(
     description="AI-Powered Career Intelligence & Workforce Readiness Platform",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
+    allow_origins=settings.cors_origins_set,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
+# Static payloads for probe endpoints, serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to SkillLens API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "status": "operational"
+})
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "environment": settings.environment,
+    "debug": settings.debug
+})
+
+# Added last so it runs first: health probes never reach CORS or routing
+app.add_middleware(HealthShortCircuitMiddleware, body=_HEALTH_BODY)
+
+
 # Root endpoint
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {
-        "message": "Welcome to SkillLens API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "status": "operational"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "environment": settings.environment,
-        "debug": settings.debug
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # Import and include routers
@@ -4,65 +4,97 @@ Provides user-friendly error messages and logging.
 """
 
 import logging
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+import orjson
+from fastapi import Response, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+def _validation_body(e: Exception) -> bytes:
+    return orjson.dumps({
+        "error": "Validation Error",
+        "message": str(e),
+        "type": "validation_error"
+    })
+
+
+# Bodies that don't depend on the exception are serialized once
+_PERMISSION_BODY = orjson.dumps({
+    "error": "Permission Denied",
+    "message": "You don't have permission to access this resource",
+    "type": "permission_error"
+})
+_NOT_FOUND_BODY = orjson.dumps({
+    "error": "Not Found",
+    "message": "The requested resource was not found",
+    "type": "not_found_error"
+})
+_SERVER_ERROR_BODY = orjson.dumps({
+    "error": "Internal Server Error",
+    "message": "An unexpected error occurred. Please try again later.",
+    "type": "server_error"
+})
+
+# Exception type -> (status code, log label, body or body builder)
+_ERROR_DISPATCH = {
+    ValueError: (status.HTTP_400_BAD_REQUEST, "Validation error", _validation_body),
+    PermissionError: (status.HTTP_403_FORBIDDEN, "Permission error", _PERMISSION_BODY),
+    FileNotFoundError: (status.HTTP_404_NOT_FOUND, "File not found", _NOT_FOUND_BODY),
+}
+
+
+class ErrorHandlingMiddleware:
     """
     Global error handling middleware.
     Catches all exceptions and returns user-friendly responses.
     """
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with error handling."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
         try:
-            response = await call_next(request)
-            return response
-        except ValueError as e:
-            # Validation errors
-            logger.warning(f"Validation error: {e}")
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "error": "Validation Error",
-                    "message": str(e),
-                    "type": "validation_error"
-                }
-            )
-        except PermissionError as e:
-            # Permission errors
-            logger.warning(f"Permission error: {e}")
-            return JSONResponse(
-                status_code=status.HTTP_403_FORBIDDEN,
-                content={
-                    "error": "Permission Denied",
-                    "message": "You don't have permission to access this resource",
-                    "type": "permission_error"
-                }
-            )
-        except FileNotFoundError as e:
-            # File not found
-            logger.warning(f"File not found: {e}")
-            return JSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={
-                    "error": "Not Found",
-                    "message": "The requested resource was not found",
-                    "type": "not_found_error"
-                }
-            )
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Generic server errors
-            logger.error(f"Unexpected error: {e}", exc_info=True)
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={
-                    "error": "Internal Server Error",
-                    "message": "An unexpected error occurred. Please try again later.",
-                    "type": "server_error"
-                }
-            )
+            # Headers already went out; nothing sensible left to send
+            if response_started:
+                raise
+            response = self._error_response(e)
+            await response(scope, receive, send)
+    
+    @staticmethod
+    def _error_response(e: Exception) -> Response:
+        """Map an exception to a user-friendly JSON response."""
+        # Walk the MRO so subclasses (e.g. UnicodeDecodeError) map like their base
+        for exc_type in type(e).__mro__:
+            handler = _ERROR_DISPATCH.get(exc_type)
+            if handler is not None:
+                status_code, label, body = handler
+                logger.warning("%s: %s", label, e)
+                if callable(body):
+                    body = body(e)
+                return Response(content=body, status_code=status_code, media_type="application/json")
+        
+        # Generic server errors (full traceback only in debug mode)
+        logger.error("Unexpected error: %s", e, exc_info=e if settings.debug else None)
+        return Response(
+            content=_SERVER_ERROR_BODY,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            media_type="application/json"
+        )
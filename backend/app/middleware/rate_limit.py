@@ -4,95 +4,152 @@ Protects API from abuse with request rate limiting.
 """
 
 import time
-from collections import defaultdict
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Dict, Tuple
+from collections import OrderedDict
+import orjson
+from fastapi import Response, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import List
 
+# Paths exempt from rate limiting (health probes and docs)
+_SKIP_PATHS: frozenset[str] = frozenset({"/health", "/", "/docs", "/redoc", "/openapi.json"})
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+
+class _Bucket:
+    """Per-IP token state, mutated in place on every request."""
+    
+    __slots__ = ("tokens_minute", "tokens_hour", "last_ts")
+    
+    def __init__(self, now: float, capacity_minute: float, capacity_hour: float):
+        self.tokens_minute = capacity_minute
+        self.tokens_hour = capacity_hour
+        self.last_ts = now
+
+
+class RateLimitMiddleware:
     """
     Rate limiting middleware using token bucket algorithm.
     
     Limits:
     - 100 requests per minute per IP
     - 1000 requests per hour per IP
+    
+    Each IP has two buckets that refill continuously at limit/window tokens
+    per second, up to the limit.
     """
     
-    def __init__(self, app, requests_per_minute: int = 100, requests_per_hour: int = 1000):
-        super().__init__(app)
+    NUM_SHARDS = 64  # Power of two so the shard index is a mask
+    IDLE_TTL = 3600  # Buckets idle this long are full again, so dropping them is lossless
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 100,
+        requests_per_hour: int = 1000,
+        max_entries: int = 100_000
+    ):
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
         
-        # Storage: {ip: [(timestamp, count_minute, count_hour)]}
-        self.request_counts: Dict[str, Tuple[float, int, int]] = defaultdict(lambda: (time.time(), 0, 0))
+        # Refill rates in tokens per second
+        self.minute_rate = requests_per_minute / 60
+        self.hour_rate = requests_per_hour / 3600
         
-        # Cleanup interval
-        self.last_cleanup = time.time()
-        self.cleanup_interval = 300  # 5 minutes
+        # Storage sharded by IP hash: shards[i] = {ip: _Bucket}, least recently used first
+        # Runs on a single event loop, so shards need no locks
+        self.shards: List[OrderedDict[str, _Bucket]] = [OrderedDict() for _ in range(self.NUM_SHARDS)]
+        self.shard_capacity = max(1, max_entries // self.NUM_SHARDS)
+        
+        # Static header values, encoded once
+        self._limit_minute_header = (b"x-ratelimit-limit-minute", str(requests_per_minute).encode("latin-1"))
+        self._limit_hour_header = (b"x-ratelimit-limit-hour", str(requests_per_hour).encode("latin-1"))
+        
+        # 429 bodies are constant per limit, so build them once too
+        self._minute_exceeded_body = orjson.dumps(
+            {"detail": f"Rate limit exceeded: {requests_per_minute} requests per minute. Try again later."}
+        )
+        self._hour_exceeded_body = orjson.dumps(
+            {"detail": f"Rate limit exceeded: {requests_per_hour} requests per hour. Try again later."}
+        )
     
-    def _cleanup_old_entries(self):
-        """Remove old entries to prevent memory leak."""
-        current_time = time.time()
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            # Remove entries older than 1 hour
-            cutoff = current_time - 3600
-            self.request_counts = {
-                ip: data for ip, data in self.request_counts.items()
-                if data[0] > cutoff
-            }
-            self.last_cleanup = current_time
+    def _evict_idle(self, shard: OrderedDict[str, _Bucket], current_time: float):
+        """Drop expired buckets from the LRU end of a shard to prevent memory leak."""
+        cutoff = current_time - self.IDLE_TTL
+        while shard:
+            ip, bucket = next(iter(shard.items()))
+            if bucket.last_ts > cutoff:
+                break
+            del shard[ip]
+    
+    @staticmethod
+    async def _reject(body: bytes, scope: Scope, receive: Receive, send: Send):
+        """Send a 429 response with a pre-serialized body."""
+        response = Response(
+            content=body,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            media_type="application/json"
+        )
+        await response(scope, receive, send)
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request with rate limiting."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Skip rate limiting for health checks
-        if request.url.path in ["/health", "/", "/docs", "/redoc", "/openapi.json"]:
-            return await call_next(request)
+        if scope["path"] in _SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
         
         # Get client IP
-        client_ip = request.client.host
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         current_time = time.time()
         
-        # Get current counts
-        last_time, minute_count, hour_count = self.request_counts[client_ip]
-        
-        # Reset minute counter if 60 seconds passed
-        if current_time - last_time >= 60:
-            minute_count = 0
-            last_time = current_time
-        
-        # Reset hour counter if 3600 seconds passed
-        if current_time - last_time >= 3600:
-            hour_count = 0
+        shard = self.shards[hash(client_ip) & (self.NUM_SHARDS - 1)]
+        self._evict_idle(shard, current_time)
         
-        # Increment counters
-        minute_count += 1
-        hour_count += 1
+        # Refill buckets for the time elapsed since the last request
+        bucket = shard.get(client_ip)
+        if bucket is None:
+            # Bound memory: evict the least recently seen IP when the shard is full
+            if len(shard) >= self.shard_capacity:
+                shard.popitem(last=False)
+            bucket = shard[client_ip] = _Bucket(current_time, self.requests_per_minute, self.requests_per_hour)
+        else:
+            shard.move_to_end(client_ip)
+            elapsed = current_time - bucket.last_ts
+            bucket.tokens_minute = min(self.requests_per_minute, bucket.tokens_minute + elapsed * self.minute_rate)
+            bucket.tokens_hour = min(self.requests_per_hour, bucket.tokens_hour + elapsed * self.hour_rate)
+            bucket.last_ts = current_time
         
         # Check limits
-        if minute_count > self.requests_per_minute:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded: {self.requests_per_minute} requests per minute. Try again later."
-            )
+        if bucket.tokens_minute < 1:
+            await self._reject(self._minute_exceeded_body, scope, receive, send)
+            return
         
-        if hour_count > self.requests_per_hour:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded: {self.requests_per_hour} requests per hour. Try again later."
-            )
+        if bucket.tokens_hour < 1:
+            await self._reject(self._hour_exceeded_body, scope, receive, send)
+            return
         
-        # Update counts
-        self.request_counts[client_ip] = (last_time, minute_count, hour_count)
+        # Consume a token from each bucket
+        bucket.tokens_minute -= 1
+        bucket.tokens_hour -= 1
+        remaining_minute = int(bucket.tokens_minute)
+        remaining_hour = int(bucket.tokens_hour)
         
-        # Periodic cleanup
-        self._cleanup_old_entries()
+        # Add rate limit headers straight onto the raw ASGI header list
+        rate_limit_headers = [
+            self._limit_minute_header,
+            (b"x-ratelimit-remaining-minute", str(remaining_minute).encode("latin-1")),
+            self._limit_hour_header,
+            (b"x-ratelimit-remaining-hour", str(remaining_hour).encode("latin-1")),
+        ]
         
-        # Add rate limit headers
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit-Minute"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining-Minute"] = str(self.requests_per_minute - minute_count)
-        response.headers["X-RateLimit-Limit-Hour"] = str(self.requests_per_hour)
-        response.headers["X-RateLimit-Remaining-Hour"] = str(self.requests_per_hour - hour_count)
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *rate_limit_headers]
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
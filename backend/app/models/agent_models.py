@@ -2,11 +2,13 @@
 Pydantic models for AI Agent module.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from app.models.common import utc_now
+
 
 class MessageRole(str, Enum):
     """Message role enumeration."""
@@ -19,7 +21,7 @@ class ChatMessage(BaseModel):
     """Individual chat message."""
     role: MessageRole
     content: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utc_now)
     metadata: Optional[Dict[str, Any]] = None
 
 
@@ -29,8 +31,8 @@ class ChatRequest(BaseModel):
     message: str
     context: Optional[Dict[str, Any]] = None
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "user_id": "user123",
                 "message": "I want to become a full-stack developer. What skills do I need?",
@@ -40,6 +42,7 @@ class ChatRequest(BaseModel):
                 }
             }
         }
+    )
 
 
 class AgentResponse(BaseModel):
@@ -67,8 +70,8 @@ class ConversationHistory(BaseModel):
     conversation_id: str
     messages: List[ChatMessage]
     context: ConversationContext
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
 
 
 class LearningStep(BaseModel):
@@ -89,10 +92,10 @@ class LearningPath(BaseModel):
     steps: List[LearningStep]
     total_estimated_time: str
     skill_dependencies: Dict[str, List[str]] = {}
-    generated_at: datetime = Field(default_factory=datetime.utcnow)
+    generated_at: datetime = Field(default_factory=utc_now)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "user_id": "user123",
                 "target_role": "Full Stack Developer",
@@ -115,6 +118,7 @@ class LearningPath(BaseModel):
                 }
             }
         }
+    )
 
 
 class LearningPathRequest(BaseModel):
@@ -125,8 +129,8 @@ class LearningPathRequest(BaseModel):
     current_skills: List[str] = []
     experience_level: str = "Beginner"  # Beginner, Intermediate, Advanced
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "user_id": "user123",
                 "resume_id": "resume456",
@@ -135,3 +139,4 @@ class LearningPathRequest(BaseModel):
                 "experience_level": "Beginner"
             }
         }
+    )
@@ -0,0 +1,11 @@
+"""
+Shared helpers for Pydantic models.
+"""
+
+import time
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.fromtimestamp(time.time(), tz=timezone.utc)
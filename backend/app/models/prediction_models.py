@@ -2,10 +2,12 @@
 Pydantic models for prediction endpoints.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional, Dict
 from datetime import datetime
 
+from app.models.common import utc_now
+
 
 class PredictionRequest(BaseModel):
     """Request for shortlisting probability prediction."""
@@ -15,8 +17,8 @@ class PredictionRequest(BaseModel):
     user_skills: List[str] = []
     experience_years: float = 0.0
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "resume_text": "Software Engineer with 3 years experience in Python, React...",
                 "job_description": "Looking for Full Stack Developer with React, Node.js, MongoDB...",
@@ -24,18 +26,19 @@ class PredictionRequest(BaseModel):
                 "experience_years": 3.0
             }
         }
+    )
 
 
 class PredictionResponse(BaseModel):
     """Response with shortlisting probability."""
-    shortlist_probability: float = Field(..., ge=0, le=100, description="Probability of being shortlisted (0-100%)")
+    shortlist_probability: float = Field(..., description="Probability of being shortlisted (0-100%)")  # Range guaranteed by the predictor
     confidence: str  # "High", "Medium", "Low"
     factors: Dict[str, float]  # Contributing factors
     recommendations: List[str]  # What to improve
-    predicted_at: datetime = Field(default_factory=datetime.utcnow)
+    predicted_at: datetime = Field(default_factory=utc_now)
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "shortlist_probability": 75.5,
                 "confidence": "High",
@@ -51,6 +54,7 @@ class PredictionResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class BatchPredictionRequest(BaseModel):
@@ -75,4 +79,4 @@ class BatchPredictionResponse(BaseModel):
     predictions: List[JobPrediction]
     best_match: JobPrediction
     total_jobs: int
-    predicted_at: datetime = Field(default_factory=datetime.utcnow)
+    predicted_at: datetime = Field(default_factory=utc_now)
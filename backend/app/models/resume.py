@@ -2,9 +2,30 @@
 Pydantic models for resume data.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import List, Optional, Dict
 from datetime import datetime
+import base64
+
+import numpy as np
+
+_URLSAFE_B64 = str.maketrans("+/", "-_")
+
+
+def quantize_int8(vector: np.ndarray) -> tuple[bytes, float]:
+    """Symmetric int8 quantization; returns packed bytes and the dequantization scale."""
+    vector = np.asarray(vector, dtype=np.float32)
+    scale = float(np.max(np.abs(vector))) / 127.0 if vector.size else 0.0
+    if scale == 0.0:
+        return np.zeros(vector.shape, dtype=np.int8).tobytes(), 1.0
+    return np.round(vector / scale).astype(np.int8).tobytes(), scale
+
+
+def int8_dot(a: bytes, scale_a: float, b: bytes, scale_b: float) -> float:
+    """Dot product of two int8-quantized vectors, accumulated in int32."""
+    qa = np.frombuffer(a, dtype=np.int8).astype(np.int32)
+    qb = np.frombuffer(b, dtype=np.int8).astype(np.int32)
+    return float(np.dot(qa, qb)) * scale_a * scale_b
 
 
 class Experience(BaseModel):
@@ -42,7 +63,30 @@ class ResumeData(BaseModel):
     projects: List[Project] = []
     education: List[Education] = []
     certifications: List[str] = []
-    embeddings: Optional[List[float]] = None
+    embeddings: Optional[bytes] = None  # Packed vector, base64 in JSON
+    embeddings_scale: Optional[float] = None  # Set when embeddings are int8; float32 otherwise
+    
+    model_config = ConfigDict(ser_json_bytes="base64")
+    
+    @field_validator("embeddings", mode="before")
+    @classmethod
+    def _decode_embeddings(cls, value):
+        """Accept packed bytes, base64 text (JSON/JSONB round-trip) or a legacy float list."""
+        if isinstance(value, str):
+            # Pydantic emits standard or URL-safe base64 depending on version; accept either
+            value = value.translate(_URLSAFE_B64).rstrip("=")
+            return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        if isinstance(value, list):
+            return np.asarray(value, dtype=np.float32).tobytes() if value else None
+        return value
+    
+    def embeddings_array(self) -> Optional[np.ndarray]:
+        """Embedding vector as float32, dequantized if stored as int8."""
+        if not self.embeddings:
+            return None
+        if self.embeddings_scale is None:
+            return np.frombuffer(self.embeddings, dtype=np.float32)
+        return np.frombuffer(self.embeddings, dtype=np.int8).astype(np.float32) * self.embeddings_scale
 
 
 class ResumeUploadResponse(BaseModel):
@@ -64,5 +108,4 @@ class ResumeInDB(BaseModel):
     uploaded_at: datetime
     updated_at: datetime
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
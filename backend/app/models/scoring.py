@@ -2,7 +2,7 @@
 Pydantic models for career readiness scoring.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
@@ -18,7 +18,7 @@ class FactorContribution(BaseModel):
 
 class ReadinessScore(BaseModel):
     """Career readiness score model."""
-    overall_score: float = Field(..., ge=0, le=100)
+    overall_score: float  # 0-100, guaranteed by the scoring engine
     target_role: str
     factors: List[FactorContribution]
     explanation: str
@@ -41,8 +41,7 @@ class ReadinessScoreInDB(BaseModel):
     score_data: ReadinessScore
     calculated_at: datetime
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class ReadinessHistory(BaseModel):
@@ -2,7 +2,7 @@
 Pydantic models for user management and authentication.
 """
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -47,8 +47,7 @@ class UserInDB(UserBase):
     updated_at: datetime
     is_active: bool = True
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class UserResponse(UserBase):
@@ -59,8 +58,7 @@ class UserResponse(UserBase):
     created_at: datetime
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
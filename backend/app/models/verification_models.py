@@ -7,6 +7,8 @@ from typing import List, Optional, Dict
 from datetime import datetime
 from enum import Enum
 
+from app.models.common import utc_now
+
 
 class QuestionType(str, Enum):
     """Question type enumeration."""
@@ -50,7 +52,7 @@ class AssessmentResponse(BaseModel):
     questions: List[Question]
     total_points: int
     time_limit_minutes: int
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
 
 
 class AnswerSubmission(BaseModel):
@@ -77,4 +79,4 @@ class AssessmentResult(BaseModel):
     confidence_level: str  # "Verified", "Partial", "Not Verified"
     passed: bool
     feedback: List[str]
-    completed_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: datetime = Field(default_factory=utc_now)
@@ -4,8 +4,11 @@ Endpoints for conversational AI agent and learning path generation.
 """
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from typing import Optional
 
+import orjson
+
 from app.models.agent_models import (
     ChatRequest, AgentResponse, ConversationHistory,
     LearningPathRequest, LearningPath
@@ -13,10 +16,10 @@ from app.models.agent_models import (
 from app.services.ai_agent import get_agent
 from app.services.learning_path_generator import get_learning_path_generator
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-@router.post("/chat", response_model=AgentResponse)
+@router.post("/chat", response_model=AgentResponse, response_model_exclude_none=True)
 async def chat_with_agent(request: ChatRequest):
     """
     Send a message to the AI agent and get a response.
@@ -40,7 +43,30 @@ async def chat_with_agent(request: ChatRequest):
         )
 
 
-@router.get("/conversation/{user_id}", response_model=Optional[ConversationHistory])
+@router.post("/chat/stream")
+async def chat_with_agent_stream(request: ChatRequest):
+    """
+    Same as /chat, but streams the reply as server-sent events.
+    
+    Each "data" event carries {"delta": "<text>"}; a final "done" event
+    carries suggestions and metadata (or an "error" event on failure).
+    """
+    try:
+        agent = get_agent()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing chat request: {str(e)}"
+        )
+    return StreamingResponse(
+        agent.chat_stream(request),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/conversation/{user_id}", response_model=Optional[ConversationHistory], response_model_exclude_none=True)
 async def get_conversation_history(user_id: str):
     """
     Retrieve conversation history for a user.
@@ -124,21 +150,25 @@ async def generate_learning_path(request: LearningPathRequest):
         )
 
 
+# Healthy payload, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "AI Agent",
+    "features": [
+        "Conversational AI",
+        "Learning Path Generation",
+        "Skill Gap Analysis",
+        "Personalized Recommendations"
+    ]
+})
+
+
 @router.get("/health")
 async def agent_health_check():
     """Health check for AI agent service."""
     try:
-        agent = get_agent()
-        return {
-            "status": "healthy",
-            "service": "AI Agent",
-            "features": [
-                "Conversational AI",
-                "Learning Path Generation",
-                "Skill Gap Analysis",
-                "Personalized Recommendations"
-            ]
-        }
+        get_agent()
+        return Response(content=_HEALTH_BODY, media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -4,14 +4,19 @@ Endpoints for institutional analytics and reporting.
 """
 
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from typing import Optional
 
+import orjson
+
 from app.services.institutional_analytics import get_analytics_service
+from app.services.response_cache import cached
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get("/placement-statistics")
+@cached(namespace="analytics")
 async def get_placement_statistics(department: Optional[str] = Query(None)):
     """
     Get placement statistics for institution or specific department.
@@ -30,6 +35,7 @@ async def get_placement_statistics(department: Optional[str] = Query(None)):
 
 
 @router.get("/readiness-distribution")
+@cached(namespace="analytics")
 async def get_readiness_distribution():
     """
     Get distribution of student readiness scores.
@@ -48,6 +54,7 @@ async def get_readiness_distribution():
 
 
 @router.get("/skill-gap-analysis")
+@cached(namespace="analytics")
 async def get_skill_gap_analysis():
     """
     Get institution-wide skill gap analysis.
@@ -66,6 +73,7 @@ async def get_skill_gap_analysis():
 
 
 @router.get("/timeline")
+@cached(namespace="analytics")
 async def get_timeline_analytics(days: int = Query(30, ge=1, le=365)):
     """
     Get time-series analytics for the past N days.
@@ -83,16 +91,36 @@ async def get_timeline_analytics(days: int = Query(30, ge=1, le=365)):
         )
 
 
+@router.get("/timeline/stream")
+async def stream_timeline_analytics(days: int = Query(30, ge=1, le=365)):
+    """
+    Stream daily metrics for the past N days as NDJSON, one day per line.
+    
+    Clients see the first day immediately instead of waiting for the whole window.
+    """
+    service = get_analytics_service()
+    
+    async def ndjson():
+        async for day in service.iter_timeline_days(days):
+            yield orjson.dumps(day) + b"\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+# Static payload, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Institutional Analytics",
+    "features": [
+        "Placement Statistics",
+        "Readiness Distribution",
+        "Skill Gap Analysis",
+        "Timeline Analytics"
+    ]
+})
+
+
 @router.get("/health")
 async def analytics_health_check():
     """Health check for analytics service."""
-    return {
-        "status": "healthy",
-        "service": "Institutional Analytics",
-        "features": [
-            "Placement Statistics",
-            "Readiness Distribution",
-            "Skill Gap Analysis",
-            "Timeline Analytics"
-        ]
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
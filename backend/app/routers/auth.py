@@ -4,59 +4,57 @@ User registration, login, and profile management.
 """
 
 from fastapi import APIRouter, HTTPException, status, Depends, Header
+from fastapi.responses import ORJSONResponse, Response
 from typing import Optional
+import hmac
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+import orjson
+
+from app.database import get_db, get_db_readonly
 from app.services.auth_service import (
     get_auth_service, AuthService,
     UserCreate, UserLogin, Token, User
 )
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-async def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+def _unauthorized() -> HTTPException:
+    """Single 401 used for every authentication failure."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or missing credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_current_user(authorization: Optional[str] = Header(None)) -> User:
     """
     Dependency to get current authenticated user from JWT token.
     
+    Takes no session of its own: the user comes from the auth service cache,
+    or a short-lived session on a miss, so a route that also depends on
+    get_db/get_db_readonly holds only one pooled connection.
+    
     Usage:
         @router.get("/protected")
         async def protected_route(current_user: User = Depends(get_current_user)):
             return {"user": current_user}
     """
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    try:
-        # Extract token from "Bearer <token>"
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication scheme"
-            )
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authorization header"
-        )
+    # Missing, malformed, wrong-scheme and invalid tokens all take the same
+    # path and produce the same 401, so rejections don't reveal which check failed
+    parts = (authorization or "").split()
+    scheme, token = parts if len(parts) == 2 else ("", "")
+    scheme_ok = hmac.compare_digest(scheme.lower().encode(), b"bearer")
     
-    auth_service = get_auth_service()
-    user = await auth_service.verify_token(token, db)
+    user = None
+    if scheme_ok and token:
+        auth_service = get_auth_service()
+        user = await auth_service.verify_token(token)
     
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
+        raise _unauthorized()
     
     if not user.is_active:
         raise HTTPException(
@@ -132,7 +130,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 @router.get("/profile")
 async def get_profile(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get user profile data."""
     try:
@@ -146,18 +144,22 @@ async def get_profile(
         )
 
 
+# Static payload, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Authentication",
+    "database": "PostgreSQL",
+    "features": [
+        "User Registration",
+        "JWT Authentication",
+        "Profile Management",
+        "Password Hashing (bcrypt)",
+        "Role-based Access"
+    ]
+})
+
+
 @router.get("/health")
 async def auth_health_check():
     """Health check for auth service."""
-    return {
-        "status": "healthy",
-        "service": "Authentication",
-        "database": "PostgreSQL",
-        "features": [
-            "User Registration",
-            "JWT Authentication",
-            "Profile Management",
-            "Password Hashing (bcrypt)",
-            "Role-based Access"
-        ]
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -4,12 +4,15 @@ Endpoints for job recommendations and market intelligence.
 """
 
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, Response
 from typing import List, Optional
 from pydantic import BaseModel
 
+import orjson
+
 from app.services.job_market import get_job_market_service
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class JobRecommendationRequest(BaseModel):
@@ -62,16 +65,20 @@ async def get_market_trends(skill: Optional[str] = Query(None)):
         )
 
 
+# Static payload, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Job Market Intelligence",
+    "features": [
+        "Job Recommendations",
+        "Market Trends",
+        "Skill Demand Analysis",
+        "Salary Insights"
+    ]
+})
+
+
 @router.get("/health")
 async def jobs_health_check():
     """Health check for jobs service."""
-    return {
-        "status": "healthy",
-        "service": "Job Market Intelligence",
-        "features": [
-            "Job Recommendations",
-            "Market Trends",
-            "Skill Demand Analysis",
-            "Salary Insights"
-        ]
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
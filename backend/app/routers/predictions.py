@@ -4,6 +4,9 @@ Endpoints for ML-based shortlisting predictions.
 """
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response
+
+import orjson
 
 from app.models.prediction_models import (
     PredictionRequest, PredictionResponse,
@@ -11,7 +14,7 @@ from app.models.prediction_models import (
 )
 from app.services.predictive_model import get_predictor
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.post("/shortlist-probability", response_model=PredictionResponse)
@@ -63,6 +66,25 @@ async def predict_batch(request: BatchPredictionRequest):
         )
 
 
+_HEALTH_FEATURES = [
+    "Shortlisting Probability",
+    "Batch Predictions",
+    "Confidence Scoring",
+    "Recommendations"
+]
+
+# Both possible payloads, keyed by whether the model is loaded
+_HEALTH_BODIES = {
+    model_loaded: orjson.dumps({
+        "status": "healthy" if model_loaded else "degraded",
+        "service": "Predictions",
+        "model_loaded": model_loaded,
+        "features": _HEALTH_FEATURES
+    })
+    for model_loaded in (True, False)
+}
+
+
 @router.get("/health")
 async def predictions_health_check():
     """Health check for predictions service."""
@@ -70,17 +92,7 @@ async def predictions_health_check():
         predictor = get_predictor()
         model_loaded = predictor.model is not None
         
-        return {
-            "status": "healthy" if model_loaded else "degraded",
-            "service": "Predictions",
-            "model_loaded": model_loaded,
-            "features": [
-                "Shortlisting Probability",
-                "Batch Predictions",
-                "Confidence Scoring",
-                "Recommendations"
-            ]
-        }
+        return Response(content=_HEALTH_BODIES[model_loaded], media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -4,25 +4,64 @@ Handles resume upload, parsing, and retrieval.
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc, func, insert
+from sqlalchemy.exc import IntegrityError
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
 import os
 import uuid
 from datetime import datetime
 import logging
 
 from app.models.resume import ResumeUploadResponse, ResumeData
-from app.database import get_db, Resume as ResumeModel
+from app.database import get_db, get_db_readonly, Resume as ResumeModel
+from app.database.models import uuid7, resolve_user_uuid
 from app.services.resume_parser import resume_parser
+from app.services.response_cache import get_response_cache
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
 
-@router.post("/upload", response_model=ResumeUploadResponse, status_code=status.HTTP_201_CREATED)
+
+async def _find_duplicate(db: AsyncSession, user_uuid: uuid.UUID, content_sha256: str):
+    """Return the user's stored resume with this content hash, or None."""
+    result = await db.execute(
+        select(
+            ResumeModel.id,
+            ResumeModel.filename,
+            ResumeModel.parsed_data,
+            ResumeModel.uploaded_at
+        )
+        .where(
+            ResumeModel.user_id == user_uuid,
+            ResumeModel.content_sha256 == content_sha256
+        )
+    )
+    return result.one_or_none()
+
+
+def _duplicate_response(existing, user_uuid: uuid.UUID, file_path: str) -> ResumeUploadResponse:
+    """Drop the new copy and answer with the stored parse."""
+    os.remove(file_path)
+    logger.info(f"Duplicate upload of resume {existing.id}; reusing stored parse")
+    return ResumeUploadResponse(
+        resume_id=str(existing.id),
+        user_id=str(user_uuid),
+        filename=existing.filename,
+        parsed_data=ResumeData.model_validate(existing.parsed_data),
+        uploaded_at=existing.uploaded_at
+    )
+
+
+@router.post("/upload", response_model=ResumeUploadResponse, status_code=status.HTTP_201_CREATED, response_model_exclude_none=True)
 async def upload_resume(
     file: UploadFile = File(...),
     user_id: str = "demo_user",  # TODO: Get from auth token
@@ -36,68 +75,102 @@ async def upload_resume(
     """
     # Validate file extension
     file_extension = os.path.splitext(file.filename)[1].lower()
-    if file_extension not in settings.allowed_extensions:
+    if file_extension not in settings.allowed_extensions_set:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid file type. Allowed: {', '.join(settings.allowed_extensions)}"
         )
     
-    # Validate file size
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
-    
-    if file_size > settings.max_upload_size:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size: {settings.max_upload_size / 1024 / 1024}MB"
-        )
+    # Stream file to disk in chunks, enforcing the size limit and hashing
+    # the content as we go
+    resume_id = uuid7()
+    file_path = os.path.join(settings.upload_dir, f"{resume_id}{file_extension}")
+    file_size = 0
+    content_hash = hashlib.sha256()
     
     try:
-        # Save file
-        resume_id = uuid.uuid4()
-        file_path = os.path.join(settings.upload_dir, f"{resume_id}{file_extension}")
-        
         with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > settings.max_upload_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File too large. Maximum size: {settings.max_upload_size / 1024 / 1024}MB"
+                    )
+                content_hash.update(chunk)
+                await run_in_threadpool(f.write, chunk)
+    except BaseException:
+        # Size-limit aborts, read/write errors and client disconnects
+        # (cancellation) must not leave a partial file behind
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    
+    logger.info(f"Saved resume file: {file_path}")
+    content_sha256 = content_hash.hexdigest()
+    
+    try:
+        # Convert user_id to UUID (demo ids map to a deterministic UUID)
+        # In production, this would come from the authenticated user
+        user_uuid = resolve_user_uuid(user_id)
         
-        logger.info(f"Saved resume file: {file_path}")
+        # Re-uploading the same file is a no-op: drop the new copy and
+        # return the stored parse instead of parsing again
+        existing = await _find_duplicate(db, user_uuid, content_sha256)
+        if existing is not None:
+            return _duplicate_response(existing, user_uuid, file_path)
         
         # Parse resume
         parsed_data = await resume_parser.parse_resume(file_path)
         
-        # Convert user_id to UUID (for demo, create a fixed UUID)
-        # In production, this would come from the authenticated user
+        # Store in database; RETURNING hands back the server-side timestamp
+        # without a follow-up refresh round-trip
         try:
-            user_uuid = uuid.UUID(user_id)
-        except ValueError:
-            # For demo user, create a deterministic UUID
-            user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
-        
-        # Store in database
-        resume = ResumeModel(
-            id=resume_id,
-            user_id=user_uuid,
-            filename=file.filename,
-            file_path=file_path,
-            parsed_data=parsed_data.model_dump()
-        )
-        
-        db.add(resume)
-        await db.commit()
-        await db.refresh(resume)
+            result = await db.execute(
+                insert(ResumeModel)
+                .values(
+                    id=resume_id,
+                    user_id=user_uuid,
+                    filename=file.filename,
+                    file_path=file_path,
+                    parsed_data=parsed_data.model_dump(mode="json"),
+                    content_sha256=content_sha256
+                )
+                .returning(ResumeModel.uploaded_at)
+            )
+            uploaded_at = result.scalar_one()
+            await db.commit()
+        except IntegrityError:
+            # A concurrent upload of the same file won the unique
+            # (user_id, content_sha256) insert; answer with its row
+            await db.rollback()
+            existing = await _find_duplicate(db, user_uuid, content_sha256)
+            if existing is None:
+                raise
+            return _duplicate_response(existing, user_uuid, file_path)
         
         logger.info(f"Resume stored in database: {resume_id}")
         
+        # Upload counts and skill aggregates changed
+        await get_response_cache().clear("analytics")
+        
         return ResumeUploadResponse(
-            resume_id=str(resume.id),
-            user_id=str(resume.user_id),
-            filename=resume.filename,
+            resume_id=str(resume_id),
+            user_id=str(user_uuid),
+            filename=file.filename,
             parsed_data=parsed_data,
-            uploaded_at=resume.uploaded_at
+            uploaded_at=uploaded_at
         )
     
+    except BrokenProcessPool:
+        # The document crashed (or exhausted memory in) its parse worker
+        logger.error(f"Resume crashed the parser: {file_path}")
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Could not parse this document"
+        )
     except Exception as e:
         logger.error(f"Error uploading resume: {e}")
         # Clean up file if it was saved
@@ -112,17 +185,14 @@ async def upload_resume(
 @router.get("/{user_id}")
 async def get_user_resume(
     user_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get the most recent resume for a user.
     
     - **user_id**: User ID
     """
-    try:
-        user_uuid = uuid.UUID(user_id)
-    except ValueError:
-        user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
+    user_uuid = resolve_user_uuid(user_id)
     
     result = await db.execute(
         select(ResumeModel)
@@ -153,7 +223,7 @@ async def get_user_resume(
 async def list_resumes(
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     List all resumes (admin endpoint).
@@ -161,33 +231,46 @@ async def list_resumes(
     - **skip**: Number of records to skip
     - **limit**: Maximum number of records to return
     """
-    # Get total count
-    count_result = await db.execute(select(func.count(ResumeModel.id)))
-    total = count_result.scalar()
-    
-    # Get resumes
+    # Project only the listed columns (skipping parsed_data JSONB), with the
+    # total count as a window column, in one round-trip
     result = await db.execute(
-        select(ResumeModel)
+        select(
+            ResumeModel.id,
+            ResumeModel.user_id,
+            ResumeModel.filename,
+            ResumeModel.uploaded_at,
+            func.count().over().label("total")
+        )
         .order_by(desc(ResumeModel.uploaded_at))
         .offset(skip)
         .limit(limit)
     )
-    resumes = result.scalars().all()
+    rows = result.all()
     
-    return {
+    if rows:
+        total = rows[0].total
+    elif skip > 0:
+        # Page past the end carries no rows to read the window from
+        count_result = await db.execute(select(func.count(ResumeModel.id)))
+        total = count_result.scalar()
+    else:
+        total = 0
+    
+    # orjson renders UUIDs and datetimes natively, so skip jsonable_encoder
+    return ORJSONResponse({
         "total": total,
         "skip": skip,
         "limit": limit,
         "resumes": [
             {
-                "resume_id": str(r.id),
-                "user_id": str(r.user_id),
+                "resume_id": r.id,
+                "user_id": r.user_id,
                 "filename": r.filename,
                 "uploaded_at": r.uploaded_at
             }
-            for r in resumes
+            for r in rows
         ]
-    }
+    })
 
 
 @router.delete("/{resume_id}")
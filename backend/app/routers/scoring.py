@@ -4,22 +4,73 @@ Handles career readiness scoring and explanations.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, insert, cast, Text, tuple_
+from collections import OrderedDict
 from datetime import datetime
+from typing import Optional
 import logging
 import uuid
 
+import orjson
+
 from app.models.scoring import ReadinessScoreRequest, ReadinessScore
-from app.database import get_db, Resume as ResumeModel, ReadinessScore as ScoreModel
+from app.models.resume import ResumeData
+from app.database import get_db, get_db_readonly, Resume as ResumeModel, ReadinessScore as ScoreModel
+from app.database.models import resolve_user_uuid
 from app.services.scoring_engine import scoring_engine
+from app.services.response_cache import get_response_cache
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Role skill requirements, built once at import rather than per request.
+# Frozensets let the scoring engine intersect against them without rehashing.
+_ROLE_REQUIREMENTS = {
+    "Data Engineer": {
+        "skills": frozenset({"Python", "SQL", "Apache Spark", "ETL", "Data Modeling", "AWS", "Docker"}),
+        "tools": frozenset({"Git", "Jupyter", "Airflow"})
+    },
+    "Software Engineer": {
+        "skills": frozenset({"Python", "Java", "JavaScript", "SQL", "Docker", "CI/CD"}),
+        "tools": frozenset({"Git", "Jira", "Jenkins"})
+    },
+    "Data Scientist": {
+        "skills": frozenset({"Python", "R", "SQL", "Machine Learning", "Statistics", "Deep Learning"}),
+        "tools": frozenset({"Jupyter", "Git", "TensorFlow"})
+    },
+    "Full Stack Developer": {
+        "skills": frozenset({"JavaScript", "React", "Node.js", "SQL", "MongoDB", "Docker"}),
+        "tools": frozenset({"Git", "VS Code", "Postman"})
+    }
+}
+_EMPTY_REQUIREMENTS = {"skills": frozenset(), "tools": frozenset()}
+
+# Validated ResumeData keyed by (resume id, updated_at); an edit bumps
+# updated_at, so stale entries are never hit and just age out of the LRU
+RESUME_DATA_CACHE_SIZE = 1024
+_resume_data_cache: "OrderedDict[tuple, ResumeData]" = OrderedDict()
+
+
+def _load_resume_data(resume_id: uuid.UUID, updated_at: datetime, parsed_json: str) -> ResumeData:
+    """Validate stored resume JSON, reusing the model from earlier scorings."""
+    key = (resume_id, updated_at)
+    resume_data = _resume_data_cache.get(key)
+    if resume_data is not None:
+        _resume_data_cache.move_to_end(key)
+        return resume_data
+    
+    # Validate straight from the JSON text rather than a decoded dict
+    resume_data = ResumeData.model_validate_json(parsed_json)
+    if len(_resume_data_cache) >= RESUME_DATA_CACHE_SIZE:
+        _resume_data_cache.popitem(last=False)
+    _resume_data_cache[key] = resume_data
+    return resume_data
 
 
-@router.post("/readiness", response_model=ReadinessScore)
+@router.post("/readiness", response_model=ReadinessScore, response_model_exclude_none=True)
 async def calculate_readiness(
     request: ReadinessScoreRequest,
     db: AsyncSession = Depends(get_db)
@@ -33,19 +84,21 @@ async def calculate_readiness(
     """
     try:
         # Convert user_id to UUID
-        try:
-            user_uuid = uuid.UUID(request.user_id)
-        except ValueError:
-            user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, request.user_id)
+        user_uuid = resolve_user_uuid(request.user_id)
         
-        # Get user's most recent resume
+        # Get user's most recent resume (only the columns scoring needs, with
+        # parsed_data as raw JSON text for model_validate_json)
         result = await db.execute(
-            select(ResumeModel)
+            select(
+                ResumeModel.id,
+                ResumeModel.updated_at,
+                cast(ResumeModel.parsed_data, Text).label("parsed_json")
+            )
             .where(ResumeModel.user_id == user_uuid)
             .order_by(desc(ResumeModel.uploaded_at))
             .limit(1)
         )
-        resume = result.scalar_one_or_none()
+        resume = result.one_or_none()
         
         if not resume:
             raise HTTPException(
@@ -55,62 +108,42 @@ async def calculate_readiness(
         
         # Get required skills for target role
         # In production, this would come from Neo4j knowledge graph
-        role_requirements = {
-            "Data Engineer": {
-                "skills": ["Python", "SQL", "Apache Spark", "ETL", "Data Modeling", "AWS", "Docker"],
-                "tools": ["Git", "Jupyter", "Airflow"]
-            },
-            "Software Engineer": {
-                "skills": ["Python", "Java", "JavaScript", "SQL", "Docker", "CI/CD"],
-                "tools": ["Git", "Jira", "Jenkins"]
-            },
-            "Data Scientist": {
-                "skills": ["Python", "R", "SQL", "Machine Learning", "Statistics", "Deep Learning"],
-                "tools": ["Jupyter", "Git", "TensorFlow"]
-            },
-            "Full Stack Developer": {
-                "skills": ["JavaScript", "React", "Node.js", "SQL", "MongoDB", "Docker"],
-                "tools": ["Git", "VS Code", "Postman"]
-            }
-        }
-        
-        requirements = role_requirements.get(
-            request.target_role,
-            {"skills": [], "tools": []}
-        )
+        requirements = _ROLE_REQUIREMENTS.get(request.target_role, _EMPTY_REQUIREMENTS)
         
         # Parse resume data
-        from app.models.resume import ResumeData
-        resume_data = ResumeData(**resume.parsed_data)
+        resume_data = _load_resume_data(resume.id, resume.updated_at, resume.parsed_json)
         
         # Calculate readiness score
         score_result = await scoring_engine.calculate_readiness_score(
             resume_data=resume_data,
             target_role=request.target_role,
             required_skills=requirements["skills"],
-            required_tools=requirements.get("tools", [])
+            required_tools=requirements["tools"]
         )
         
-        # Store score in database
-        score_record = ScoreModel(
-            user_id=user_uuid,
-            resume_id=resume.id,
-            target_role=request.target_role,
-            overall_score=score_result.overall_score,
-            technical_skills_score=score_result.factors[0].score if len(score_result.factors) > 0 else None,
-            experience_score=score_result.factors[1].score if len(score_result.factors) > 1 else None,
-            project_score=score_result.factors[2].score if len(score_result.factors) > 2 else None,
-            tool_score=score_result.factors[3].score if len(score_result.factors) > 3 else None,
-            explanation=score_result.explanation,
-            strengths=score_result.strengths,
-            weaknesses=score_result.weaknesses,
-            recommendations=score_result.recommendations,
-            factors=[f.model_dump() for f in score_result.factors]
+        # Store score in database; the record isn't read back, so skip the refresh
+        await db.execute(
+            insert(ScoreModel).values(
+                user_id=user_uuid,
+                resume_id=resume.id,
+                target_role=request.target_role,
+                overall_score=score_result.overall_score,
+                technical_skills_score=score_result.factors[0].score if len(score_result.factors) > 0 else None,
+                experience_score=score_result.factors[1].score if len(score_result.factors) > 1 else None,
+                project_score=score_result.factors[2].score if len(score_result.factors) > 2 else None,
+                tool_score=score_result.factors[3].score if len(score_result.factors) > 3 else None,
+                explanation=score_result.explanation,
+                strengths=score_result.strengths,
+                weaknesses=score_result.weaknesses,
+                recommendations=score_result.recommendations,
+                factors=[f.model_dump() for f in score_result.factors]
+            )
         )
         
-        db.add(score_record)
         await db.commit()
-        await db.refresh(score_record)
+        
+        # Readiness aggregates changed
+        await get_response_cache().clear("analytics")
         
         logger.info(f"Calculated readiness score for user {request.user_id}: {score_result.overall_score}")
         
@@ -131,7 +164,9 @@ async def get_score_history(
     user_id: str,
     target_role: str = None,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    before: Optional[datetime] = None,
+    before_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get historical readiness scores for a user.
@@ -139,25 +174,38 @@ async def get_score_history(
     - **user_id**: User ID
     - **target_role**: Optional filter by target role
     - **limit**: Maximum number of records to return
+    - **before**, **before_id**: Keyset cursor; pass the previous page's
+      `next_cursor` values
     """
     try:
         # Convert user_id to UUID
-        try:
-            user_uuid = uuid.UUID(user_id)
-        except ValueError:
-            user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
+        user_uuid = resolve_user_uuid(user_id)
         
         # Build query
-        query = select(ScoreModel).where(ScoreModel.user_id == user_uuid)
+        # Only the rendered columns; explanation/factors stay off the wire
+        query = select(
+            ScoreModel.id,
+            ScoreModel.created_at,
+            ScoreModel.overall_score,
+            ScoreModel.target_role
+        ).where(ScoreModel.user_id == user_uuid)
         
         if target_role:
             query = query.where(ScoreModel.target_role == target_role)
         
-        query = query.order_by(desc(ScoreModel.created_at)).limit(limit)
+        # Keyset pagination: seek on (created_at, id) DESC instead of OFFSET.
+        # id breaks created_at ties, so equal timestamps at a page boundary
+        # aren't skipped; a bare timestamp cursor is still accepted.
+        if before is not None and before_id is not None:
+            query = query.where(tuple_(ScoreModel.created_at, ScoreModel.id) < tuple_(before, before_id))
+        elif before is not None:
+            query = query.where(ScoreModel.created_at < before)
+        
+        query = query.order_by(desc(ScoreModel.created_at), desc(ScoreModel.id)).limit(limit)
         
         # Execute query
         result = await db.execute(query)
-        scores = result.scalars().all()
+        scores = result.all()
         
         # Format response
         history = [
@@ -169,12 +217,18 @@ async def get_score_history(
             for score in scores
         ]
         
-        return {
+        next_cursor = None
+        if len(scores) == limit:
+            next_cursor = {"before": scores[-1].created_at, "before_id": scores[-1].id}
+        
+        # orjson renders datetimes and UUIDs natively, so skip jsonable_encoder
+        return ORJSONResponse({
             "user_id": user_id,
             "target_role": target_role,
             "history": history,
-            "count": len(history)
-        }
+            "count": len(history),
+            "next_cursor": next_cursor
+        })
     
     except Exception as e:
         logger.error(f"Error getting score history: {e}")
@@ -187,7 +241,7 @@ async def get_score_history(
 @router.get("/explanation/{user_id}")
 async def get_latest_explanation(
     user_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get the latest readiness score explanation for a user.
@@ -196,10 +250,7 @@ async def get_latest_explanation(
     """
     try:
         # Convert user_id to UUID
-        try:
-            user_uuid = uuid.UUID(user_id)
-        except ValueError:
-            user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
+        user_uuid = resolve_user_uuid(user_id)
         
         # Get latest score
         result = await db.execute(
@@ -238,17 +289,21 @@ async def get_latest_explanation(
         )
 
 
+# Static payload, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Career Readiness Scoring",
+    "database": "PostgreSQL",
+    "features": [
+        "Multi-factor Scoring",
+        "Explainable AI",
+        "Score History Tracking",
+        "Personalized Recommendations"
+    ]
+})
+
+
 @router.get("/health")
 async def scoring_health_check():
     """Health check for scoring service."""
-    return {
-        "status": "healthy",
-        "service": "Career Readiness Scoring",
-        "database": "PostgreSQL",
-        "features": [
-            "Multi-factor Scoring",
-            "Explainable AI",
-            "Score History Tracking",
-            "Personalized Recommendations"
-        ]
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -4,6 +4,7 @@ Handles skill graph operations, gap analysis, and learning paths.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse
 from typing import List
 from pydantic import BaseModel
 import logging
@@ -13,7 +14,7 @@ from app.database import get_db, Collections
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class SkillGapRequest(BaseModel):
@@ -4,6 +4,9 @@ Endpoints for skill verification assessments.
 """
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response
+
+import orjson
 
 from app.models.verification_models import (
     AssessmentRequest, AssessmentResponse,
@@ -11,7 +14,7 @@ from app.models.verification_models import (
 )
 from app.services.skill_verification import get_verification_service
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.post("/generate-assessment", response_model=AssessmentResponse)
@@ -58,16 +61,20 @@ async def submit_assessment(submission: AssessmentSubmission):
         )
 
 
+# Static payload, serialized once at import
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "Skill Verification",
+    "features": [
+        "AI-Generated Assessments",
+        "Multiple Question Types",
+        "Confidence Scoring",
+        "Detailed Feedback"
+    ]
+})
+
+
 @router.get("/health")
 async def verification_health_check():
     """Health check for verification service."""
-    return {
-        "status": "healthy",
-        "service": "Skill Verification",
-        "features": [
-            "AI-Generated Assessments",
-            "Multiple Question Types",
-            "Confidence Scoring",
-            "Detailed Feedback"
-        ]
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -6,15 +6,334 @@ Implements semantic understanding and entity extraction
 import os
 os.environ['TF_USE_LEGACY_KERAS'] = '1'
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import base64
+import hashlib
 import re
+import shutil
+import tempfile
+import threading
 from datetime import datetime
-import PyPDF2
-import docx
 from sentence_transformers import SentenceTransformer
-from transformers import pipeline
+from transformers import AutoModelForTokenClassification, AutoTokenizer
 import numpy as np
 
+from app.config import settings
+from app.models.resume import quantize_int8
+from app.services.cpu_pool import run_parse_bound
+from app.services.document_text import extract_text
+
+try:
+    import ahocorasick
+except ImportError:  # Optional; fall back to one compiled alternation
+    ahocorasick = None
+
+
+# Section and field patterns, compiled once
+_YEAR_RE = re.compile(r'(\d{4})\s*[-–]\s*(\d{4}|Present|Current)')
+# Section headers on their own line; the group name is the section kind
+_SECTION_RE = re.compile(
+    r'\n(?:(?P<experience>EXPERIENCE|WORK EXPERIENCE|EMPLOYMENT)'
+    r'|(?P<projects>PROJECTS|PROJECT WORK)'
+    r'|(?P<education>EDUCATION))\n',
+    re.IGNORECASE
+)
+# Abbreviations must stand alone ("BE" inside "became" is not a degree);
+# full words may be inflected ("Masters", "Bachelor's")
+_DEGREE_RE = re.compile(
+    r'\b(?:B\.?Tech|B\.?E\.?|M\.?Tech|M\.?E\.?|Ph\.?D)(?!\w)|\b(?:Bachelor|Master|Doctorate)',
+    re.IGNORECASE
+)
+_PROJECT_ITEM_RE = re.compile(r'\n\s*[•\-\*\d+\.]\s*')
+
+
+def _split_sections(text: str) -> Dict[str, str]:
+    """
+    Find every section header in one scan and map each kind to the body of
+    its first occurrence, which runs until the next header of any kind.
+    """
+    sections: Dict[str, str] = {}
+    headers = list(_SECTION_RE.finditer(text))
+    for i, header in enumerate(headers):
+        if header.lastgroup not in sections:
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+            sections[header.lastgroup] = text[header.end():end]
+    return sections
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _at_word_boundary(text: str, idx: int) -> bool:
+    """Same test as regex \\b at position idx."""
+    before = idx > 0 and _is_word_char(text[idx - 1])
+    after = idx < len(text) and _is_word_char(text[idx])
+    return before != after
+
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+# Dynamically INT8-quantized ONNX export published in the model repo
+EMBEDDING_ONNX_FILE = 'onnx/model_qint8_avx512_vnni.onnx'
+EMBEDDING_MAX_TOKENS = 256
+NER_MODEL = 'dslim/bert-base-NER'
+# ONNX export of the NER model, written by the first process that needs it
+NER_ONNX_DIR = os.path.join(
+    os.path.expanduser('~'), '.cache', 'skilllens', 'onnx', NER_MODEL.replace('/', '--')
+)
+# Model2Vec static embeddings: token lookups + mean pooling, no transformer
+STATIC_EMBEDDING_MODEL = 'minishlab/M2V_base_output'
+
+
+def _load_sentence_bert() -> SentenceTransformer:
+    """
+    Load the embedding model for the available hardware: fp16 PyTorch on a
+    CUDA GPU, otherwise the INT8 ONNX export on CPU, falling back to fp32
+    PyTorch.
+    """
+    import torch
+    if torch.cuda.is_available():
+        print("Sentence-BERT running on CUDA (fp16)")
+        model = SentenceTransformer(
+            EMBEDDING_MODEL,
+            device="cuda",
+            model_kwargs={"torch_dtype": torch.float16}
+        )
+    else:
+        try:
+            model = SentenceTransformer(
+                EMBEDDING_MODEL,
+                backend="onnx",
+                model_kwargs={"file_name": EMBEDDING_ONNX_FILE}
+            )
+            print("Sentence-BERT running on ONNX Runtime")
+        except Exception as e:
+            # Older sentence-transformers or no onnxruntime/optimum installed
+            print(f"ONNX backend unavailable ({e}), using PyTorch")
+            model = SentenceTransformer(EMBEDDING_MODEL)
+    
+    # The tokenizer truncates to this many subword tokens (MiniLM's cap)
+    model.max_seq_length = EMBEDDING_MAX_TOKENS
+    return model
+
+
+def _save_ner_export(model) -> None:
+    """
+    Save an exported NER model to NER_ONNX_DIR. Files are written to a temp
+    directory and renamed into place, so concurrent workers never load a
+    half-written export; if another worker got there first, ours is dropped.
+    """
+    parent = os.path.dirname(NER_ONNX_DIR)
+    try:
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent)
+    except OSError as e:
+        print(f"Could not cache NER ONNX export ({e})")
+        return
+    try:
+        model.save_pretrained(staging)
+        os.replace(staging, NER_ONNX_DIR)
+        print(f"Cached NER ONNX export in {NER_ONNX_DIR}")
+    except Exception as e:
+        print(f"Could not cache NER ONNX export ({e})")
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _load_ner() -> Tuple[Any, Any]:
+    """
+    Load the NER tokenizer and token-classification model: fp16 PyTorch on a
+    CUDA GPU, otherwise an ONNX Runtime export on CPU, falling back to fp32
+    PyTorch.
+    """
+    import torch
+    tokenizer = AutoTokenizer.from_pretrained(NER_MODEL)
+    if torch.cuda.is_available():
+        model = AutoModelForTokenClassification.from_pretrained(
+            NER_MODEL,
+            torch_dtype=torch.float16
+        ).to("cuda")
+        print("NER running on CUDA (fp16)")
+        return tokenizer, model
+    
+    try:
+        from optimum.onnxruntime import ORTModelForTokenClassification
+        if os.path.isfile(os.path.join(NER_ONNX_DIR, 'model.onnx')):
+            model = ORTModelForTokenClassification.from_pretrained(
+                NER_ONNX_DIR,
+                export=False,
+                provider="CPUExecutionProvider"
+            )
+        else:
+            # Exporting takes minutes; do it once and reuse the files after
+            model = ORTModelForTokenClassification.from_pretrained(
+                NER_MODEL,
+                export=True,
+                provider="CPUExecutionProvider"
+            )
+            _save_ner_export(model)
+        print("NER running on ONNX Runtime")
+    except Exception as e:
+        print(f"ONNX backend unavailable for NER ({e}), using PyTorch")
+        model = AutoModelForTokenClassification.from_pretrained(NER_MODEL)
+    return tokenizer, model
+
+
+def _group_entities(text: str, token_labels: Dict[Tuple[int, int], str]) -> List[Tuple[str, str]]:
+    """
+    Merge per-token BIO labels into (entity type, text) spans, like the
+    transformers pipeline's aggregation_strategy="simple": a B- tag or a
+    change of type starts a new entity, I- of the same type extends it.
+    """
+    entities = []
+    current_type = None
+    span_start = span_end = 0
+    
+    for start, end in sorted(token_labels):
+        tag, _, entity_type = token_labels[(start, end)].partition('-')
+        if entity_type and tag == 'I' and entity_type == current_type:
+            span_end = end
+            continue
+        if current_type:
+            entities.append((current_type, text[span_start:span_end]))
+        current_type = entity_type or None
+        span_start, span_end = start, end
+    
+    if current_type:
+        entities.append((current_type, text[span_start:span_end]))
+    return entities
+
+
+class _StaticEncoder:
+    """Adapts a Model2Vec StaticModel to the SentenceTransformer.encode call."""
+    
+    def __init__(self, model):
+        self.model = model
+    
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False
+    ) -> np.ndarray:
+        vectors = self.model.encode(texts, batch_size=batch_size)
+        if normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.maximum(norms, 1e-12)
+        return vectors
+
+
+def _load_embedding_model() -> Tuple[Any, str]:
+    """
+    Load the configured embedding backend. Returns the model and a version
+    tag stored with every vector so indices never mix embedding spaces.
+    """
+    if settings.embed_backend.strip().lower() == 'static':
+        from model2vec import StaticModel
+        print(f"Using static embeddings ({STATIC_EMBEDDING_MODEL})")
+        model = StaticModel.from_pretrained(STATIC_EMBEDDING_MODEL)
+        return _StaticEncoder(model), STATIC_EMBEDDING_MODEL
+    return _load_sentence_bert(), EMBEDDING_MODEL
+
+
+class _HashLRU:
+    """Small LRU keyed by a content digest, with hit/miss counters."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[bytes, Any]" = OrderedDict()
+    
+    def get(self, key: bytes) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def put(self, key: bytes, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class BatchedEncoder:
+    """
+    Micro-batcher for Sentence-BERT.
+    
+    Concurrent encode() calls are queued and drained together (up to
+    max_batch_size, waiting at most max_wait seconds for stragglers), so one
+    forward pass serves many resumes. SentenceTransformer.encode sorts its
+    inputs by length before padding, which keeps short resumes from being
+    padded up to the longest in the batch.
+    """
+    
+    def __init__(self, model: SentenceTransformer, max_batch_size: int = 32, max_wait: float = 0.01):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def encode(self, text: str) -> np.ndarray:
+        """Embed one text, sharing a forward pass with concurrent callers."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one request, then gather more until full or max_wait passes."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    async def _run(self):
+        """Background loop: encode each gathered batch off the event loop."""
+        while True:
+            batch = await self._next_batch()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(
+                    self.model.encode,
+                    texts,
+                    batch_size=len(texts),
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+
 class AdvancedResumeParser:
     """
     Advanced resume parser using:
@@ -23,21 +342,28 @@ class AdvancedResumeParser:
     - Pattern matching for structured data
     """
     
+    CACHE_SIZE = 4096
+    NER_MAX_LENGTH = 512
+    NER_STRIDE = 32
+    NER_BATCH_SIZE = 8
+    
     def __init__(self):
         print("Loading AI models...")
-        # Load Sentence-BERT for embeddings
-        self.sentence_bert = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        # Load Sentence-BERT (or the static backend) for embeddings
+        self.sentence_bert, self.embedding_model_version = _load_embedding_model()
+        self.encoder = BatchedEncoder(self.sentence_bert)
+        
+        # Embeddings and skills are pure functions of the text, so re-parsing
+        # the same resume is served from these, keyed by BLAKE2b(text)
+        self._embedding_cache = _HashLRU(self.CACHE_SIZE)
+        self._skills_cache = _HashLRU(self.CACHE_SIZE)
         
         # Load NER model for entity extraction
         try:
-            self.ner_pipeline = pipeline(
-                "ner",
-                model="dslim/bert-base-NER",
-                aggregation_strategy="simple"
-            )
-        except:
-            print("Warning: NER model not available, using fallback")
-            self.ner_pipeline = None
+            self._ner_tokenizer, self._ner_model = _load_ner()
+        except Exception as e:
+            print(f"Warning: NER model not available ({e}), using fallback")
+            self._ner_tokenizer = self._ner_model = None
         
         print("Models loaded successfully!")
         
@@ -72,6 +398,20 @@ class AdvancedResumeParser:
             "Git", "GitHub", "Jira", "Confluence", "Postman", "VS Code",
             "IntelliJ", "Figma", "Adobe XD"
         ]
+        
+        # Match every skill in one pass over the text instead of one
+        # re.search per skill
+        if ahocorasick is not None:
+            self._skill_automaton = ahocorasick.Automaton()
+            for skill in self.common_skills:
+                self._skill_automaton.add_word(skill.lower(), skill)
+            self._skill_automaton.make_automaton()
+        else:
+            self._skill_automaton = None
+            self._skill_lookup = {skill.lower(): skill for skill in self.common_skills}
+            self._skill_pattern = re.compile(
+                r'\b(?:' + '|'.join(map(re.escape, self._skill_lookup)) + r')\b'
+            )
     
     async def parse_resume(self, file_path: str, file_type: str) -> Dict:
         """
@@ -82,25 +422,36 @@ class AdvancedResumeParser:
             file_type: 'pdf' or 'docx'
             
         Returns:
-            Parsed resume data with embeddings and entities
+            Parsed resume data with embeddings and entities. 'embeddings' is
+            the int8-quantized vector as base64; multiply the int8 values by
+            'embeddings_scale' to recover float32 ('embedding_precision').
         """
-        # Extract text
-        text = self._extract_text(file_path, file_type)
+        # Extract text in the parse pool; extract_text lives in a module
+        # without model imports, so workers don't load torch to run it
+        text = await run_parse_bound(extract_text, file_path, file_type)
         
         if not text:
             raise ValueError("Could not extract text from resume")
         
-        # Generate semantic embeddings
-        embeddings = self._generate_embeddings(text)
+        text_hash = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        
+        cached_skills = self._skills_cache.get(text_hash)
         
-        # Extract entities using NER
-        entities = self._extract_entities(text)
+        # The encoder, NER and pattern extractors are independent; run them
+        # concurrently so the parse takes about as long as the slowest one.
+        # The torch forward passes release the GIL, so the threads overlap.
+        embeddings, entities, (skills, experience, education, projects) = await asyncio.gather(
+            self._generate_embeddings(text, text_hash),
+            asyncio.to_thread(self._extract_entities, text),
+            asyncio.to_thread(self._extract_structured, text, cached_skills)
+        )
         
-        # Extract structured data
-        skills = self._extract_skills(text)
-        experience = self._extract_experience(text)
-        education = self._extract_education(text)
-        projects = self._extract_projects(text)
+        if cached_skills is None:
+            self._skills_cache.put(text_hash, skills)
+        skills = list(skills)
+        
+        # 1 byte per dimension instead of a list of Python floats
+        packed, scale = quantize_int8(embeddings)
         
         # Calculate resume quality score
         quality_score = self._calculate_quality_score({
@@ -113,8 +464,11 @@ class AdvancedResumeParser:
         
         return {
             'text': text,
-            'embeddings': embeddings.tolist(),
+            'embeddings': base64.b64encode(packed).decode('ascii'),
+            'embeddings_scale': scale,
+            'embedding_precision': 'int8',
             'embedding_dimension': len(embeddings),
+            'embedding_model_version': self.embedding_model_version,
             'entities': entities,
             'skills': skills,
             'experience': experience,
@@ -124,53 +478,75 @@ class AdvancedResumeParser:
             'parsed_at': datetime.utcnow().isoformat()
         }
     
-    def _extract_text(self, file_path: str, file_type: str) -> str:
-        """Extract text from PDF or DOCX"""
-        try:
-            if file_type.lower() == 'pdf':
-                return self._extract_from_pdf(file_path)
-            elif file_type.lower() in ['docx', 'doc']:
-                return self._extract_from_docx(file_path)
-            else:
-                raise ValueError(f"Unsupported file type: {file_type}")
-        except Exception as e:
-            print(f"Error extracting text: {e}")
-            return ""
-    
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF"""
-        text = ""
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        except Exception as e:
-            print(f"PDF extraction error: {e}")
-        return text.strip()
+    def warmup(self):
+        """Run one tiny input through each model so the first request doesn't pay for lazy init"""
+        self.sentence_bert.encode(["warmup"], batch_size=1, convert_to_numpy=True)
+        if self._ner_model is not None:
+            self._run_ner("warmup")
     
-    def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX"""
-        text = ""
-        try:
-            doc = docx.Document(file_path)
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-        except Exception as e:
-            print(f"DOCX extraction error: {e}")
-        return text.strip()
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Entry and hit/miss counts for the per-text caches"""
+        return {
+            "embeddings": self._embedding_cache.stats(),
+            "skills": self._skills_cache.stats()
+        }
     
-    def _generate_embeddings(self, text: str) -> np.ndarray:
-        """Generate 384-dimensional semantic embeddings using Sentence-BERT"""
-        # Truncate if too long (BERT has max length)
-        max_length = 512
-        words = text.split()
-        if len(words) > max_length:
-            text = ' '.join(words[:max_length])
-        
-        embeddings = self.sentence_bert.encode(text)
+    async def _generate_embeddings(self, text: str, text_hash: Optional[bytes] = None) -> np.ndarray:
+        """Generate semantic embeddings (384-d Sentence-BERT, 256-d static)"""
+        if text_hash is not None:
+            cached = self._embedding_cache.get(text_hash)
+            if cached is not None:
+                return cached
+        
+        # Batched with any concurrent parses. Truncation to the model's token
+        # limit happens in the tokenizer; vectors come back unit-length, so
+        # cosine similarity is a plain dot product.
+        embeddings = await self.encoder.encode(text)
+        
+        if text_hash is not None:
+            embeddings.setflags(write=False)  # Shared with later cache hits
+            self._embedding_cache.put(text_hash, embeddings)
         return embeddings
     
+    def _run_ner(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Tag the whole text in model-length token windows that overlap by
+        NER_STRIDE tokens, run NER_BATCH_SIZE windows per forward pass and
+        return (entity type, text) spans.
+        """
+        import torch
+        encoded = self._ner_tokenizer(
+            text,
+            truncation=True,
+            max_length=self.NER_MAX_LENGTH,
+            stride=self.NER_STRIDE,
+            return_overflowing_tokens=True,
+            return_offsets_mapping=True,
+            padding=True,
+            return_tensors="pt"
+        )
+        offsets = encoded.pop("offset_mapping").tolist()
+        encoded.pop("overflow_to_sample_mapping", None)
+        id2label = self._ner_model.config.id2label
+        
+        # Label per token character span; tokens in the overlap between two
+        # windows keep the label from the first window
+        token_labels: Dict[Tuple[int, int], str] = {}
+        num_windows = len(offsets)
+        with torch.inference_mode():
+            for i in range(0, num_windows, self.NER_BATCH_SIZE):
+                batch = {
+                    name: tensor[i:i + self.NER_BATCH_SIZE].to(self._ner_model.device)
+                    for name, tensor in encoded.items()
+                }
+                predictions = self._ner_model(**batch).logits.argmax(-1).tolist()
+                for window_offsets, window_labels in zip(offsets[i:i + self.NER_BATCH_SIZE], predictions):
+                    for (start, end), label_id in zip(window_offsets, window_labels):
+                        if start != end:  # Special and padding tokens span nothing
+                            token_labels.setdefault((start, end), id2label[label_id])
+        
+        return _group_entities(text, token_labels)
+    
     def _extract_entities(self, text: str) -> Dict[str, List[str]]:
         """Extract named entities using BERT-NER"""
         entities = {
@@ -180,17 +556,11 @@ class AdvancedResumeParser:
             'misc': []
         }
         
-        if not self.ner_pipeline:
+        if self._ner_model is None:
             return entities
         
         try:
-            # Run NER
-            ner_results = self.ner_pipeline(text[:512])  # Limit length
-            
-            for entity in ner_results:
-                entity_type = entity['entity_group']
-                entity_text = entity['word']
-                
+            for entity_type, entity_text in self._run_ner(text):
                 if entity_type == 'ORG':
                     entities['organizations'].append(entity_text)
                 elif entity_type == 'PER':
@@ -204,47 +574,57 @@ class AdvancedResumeParser:
         
         return entities
     
+    def _extract_structured(
+        self,
+        text: str,
+        skills: Optional[List[str]] = None
+    ) -> Tuple[List[str], List[Dict], List[Dict], List[Dict]]:
+        """Run the regex-based extractors together (one worker thread)"""
+        if skills is None:
+            skills = self._extract_skills(text)
+        sections = _split_sections(text)
+        return (
+            skills,
+            self._extract_experience(sections.get('experience', '')),
+            self._extract_education(text),
+            self._extract_projects(sections.get('projects', ''))
+        )
+    
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills using pattern matching and common skill list"""
-        found_skills = []
+        found_skills = set()
         text_lower = text.lower()
         
-        for skill in self.common_skills:
-            # Case-insensitive search with word boundaries
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
+        if self._skill_automaton is not None:
+            for end_idx, skill in self._skill_automaton.iter(text_lower):
+                # Keep \b semantics on both ends of the match
+                start_idx = end_idx - len(skill) + 1
+                if _at_word_boundary(text_lower, start_idx) and _at_word_boundary(text_lower, end_idx + 1):
+                    found_skills.add(skill)
+        else:
+            for match in self._skill_pattern.finditer(text_lower):
+                found_skills.add(self._skill_lookup[match.group()])
         
-        return list(set(found_skills))  # Remove duplicates
+        return sorted(found_skills)  # Stable order for JSON output and caching
     
-    def _extract_experience(self, text: str) -> List[Dict]:
-        """Extract work experience"""
+    def _extract_experience(self, exp_section: str) -> List[Dict]:
+        """Extract work experience from the experience section body"""
         experience = []
         
-        # Pattern for years (e.g., "2020-2023", "2020 - Present")
-        year_pattern = r'(\d{4})\s*[-–]\s*(\d{4}|Present|Current)'
-        
-        # Split by common section headers
-        sections = re.split(r'\n(?:EXPERIENCE|WORK EXPERIENCE|EMPLOYMENT)\n', text, flags=re.IGNORECASE)
-        
-        if len(sections) > 1:
-            exp_section = sections[1]
+        # Find all year ranges (e.g., "2020-2023", "2020 - Present")
+        for match in _YEAR_RE.finditer(exp_section):
+            start_year = match.group(1)
+            end_year = match.group(2)
             
-            # Find all year ranges
-            matches = re.finditer(year_pattern, exp_section)
-            for match in matches:
-                start_year = match.group(1)
-                end_year = match.group(2)
-                
-                # Get surrounding context (company, role)
-                context_start = max(0, match.start() - 100)
-                context_end = min(len(exp_section), match.end() + 200)
-                context = exp_section[context_start:context_end]
-                
-                experience.append({
-                    'period': f"{start_year} - {end_year}",
-                    'context': context.strip()
-                })
+            # Get surrounding context (company, role)
+            context_start = max(0, match.start() - 100)
+            context_end = min(len(exp_section), match.end() + 200)
+            context = exp_section[context_start:context_end]
+            
+            experience.append({
+                'period': f"{start_year} - {end_year}",
+                'context': context.strip()
+            })
         
         return experience
     
@@ -252,46 +632,32 @@ class AdvancedResumeParser:
         """Extract education details"""
         education = []
         
-        # Common degree patterns
-        degree_patterns = [
-            r'B\.?Tech', r'B\.?E\.?', r'Bachelor',
-            r'M\.?Tech', r'M\.?E\.?', r'Master',
-            r'Ph\.?D', r'Doctorate'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Get surrounding context
-                context_start = max(0, match.start() - 50)
-                context_end = min(len(text), match.end() + 150)
-                context = text[context_start:context_end]
-                
-                education.append({
-                    'degree': match.group(),
-                    'context': context.strip()
-                })
+        # All degree patterns in one pass
+        for match in _DEGREE_RE.finditer(text):
+            # Get surrounding context
+            context_start = max(0, match.start() - 50)
+            context_end = min(len(text), match.end() + 150)
+            context = text[context_start:context_end]
+            
+            education.append({
+                'degree': match.group(),
+                'context': context.strip()
+            })
         
         return education
     
-    def _extract_projects(self, text: str) -> List[Dict]:
-        """Extract project details"""
+    def _extract_projects(self, project_section: str) -> List[Dict]:
+        """Extract project details from the projects section body"""
         projects = []
         
-        # Split by common section headers
-        sections = re.split(r'\n(?:PROJECTS|PROJECT WORK)\n', text, flags=re.IGNORECASE)
+        # Split by bullet points or numbers
+        project_items = _PROJECT_ITEM_RE.split(project_section)
         
-        if len(sections) > 1:
-            project_section = sections[1]
-            
-            # Split by bullet points or numbers
-            project_items = re.split(r'\n\s*[•\-\*\d+\.]\s*', project_section)
-            
-            for item in project_items[:5]:  # Limit to 5 projects
-                if len(item.strip()) > 20:  # Ignore very short items
-                    projects.append({
-                        'description': item.strip()[:300]  # Limit length
-                    })
+        for item in project_items[:5]:  # Limit to 5 projects
+            if len(item.strip()) > 20:  # Ignore very short items
+                projects.append({
+                    'description': item.strip()[:300]  # Limit length
+                })
         
         return projects
     
@@ -300,43 +666,27 @@ class AdvancedResumeParser:
         Calculate resume quality score (0-100)
         Based on multiple factors
         """
-        score = 0.0
-        
-        # Text length (max 20 points)
+        # Text length (max 20 points): 5 base, +5 past 500/1000/2000 chars
         text_length = len(resume_data['text'])
-        if text_length > 2000:
-            score += 20
-        elif text_length > 1000:
-            score += 15
-        elif text_length > 500:
-            score += 10
-        else:
-            score += 5
-        
-        # Skills (max 30 points)
-        num_skills = len(resume_data['skills'])
-        score += min(num_skills * 3, 30)
-        
-        # Experience (max 25 points)
-        num_experience = len(resume_data['experience'])
-        score += min(num_experience * 12.5, 25)
-        
-        # Education (max 15 points)
-        num_education = len(resume_data['education'])
-        score += min(num_education * 7.5, 15)
+        score = 5 + 5 * (text_length > 500) + 5 * (text_length > 1000) + 5 * (text_length > 2000)
         
-        # Projects (max 10 points)
-        num_projects = len(resume_data['projects'])
-        score += min(num_projects * 5, 10)
+        score += min(len(resume_data['skills']) * 3, 30)        # Skills (max 30)
+        score += min(len(resume_data['experience']) * 12.5, 25)  # Experience (max 25)
+        score += min(len(resume_data['education']) * 7.5, 15)    # Education (max 15)
+        score += min(len(resume_data['projects']) * 5, 10)       # Projects (max 10)
         
-        return min(score, 100.0)
+        return min(float(score), 100.0)
 
 # Singleton instance
 _parser_instance = None
+_parser_lock = threading.Lock()
 
 def get_parser() -> AdvancedResumeParser:
     """Get or create parser instance"""
     global _parser_instance
     if _parser_instance is None:
-        _parser_instance = AdvancedResumeParser()
+        # Model loading takes seconds; don't let concurrent callers each build one
+        with _parser_lock:
+            if _parser_instance is None:
+                _parser_instance = AdvancedResumeParser()
     return _parser_instance
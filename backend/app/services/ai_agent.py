@@ -3,16 +3,22 @@ Adaptive AI Learning Agent Service
 Provides personalized career guidance using LangChain and OpenAI.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_openai_functions_agent
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.memory import ConversationBufferMemory
 from langchain.tools import Tool
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from pymongo import ReturnDocument, UpdateOne
 
 from app.config import settings
 from app.database import MongoDB
@@ -20,17 +26,64 @@ from app.models.agent_models import (
     ChatMessage, ChatRequest, AgentResponse, 
     ConversationHistory, ConversationContext, MessageRole
 )
+from app.models.common import utc_now
+from app.services.semantic_cache import get_semantic_cache
 from app.services.skill_knowledge_graph import SkillKnowledgeGraph
 
 logger = logging.getLogger(__name__)
 
 
+CHAT_BATCH_CONCURRENCY = 10  # LLM calls in flight per chat_batch
+
+_BASE_PROMPT = """You are SkillLens AI, an expert career guidance counselor specializing in helping engineering students prepare for their careers.
+
+Your role is to:
+1. Provide personalized, actionable career advice
+2. Analyze skill gaps and recommend learning paths
+3. Explain technical concepts clearly
+4. Motivate and encourage students
+5. Give specific, data-driven recommendations
+
+Guidelines:
+- Be encouraging and supportive
+- Provide specific, actionable advice (not generic)
+- Reference the student's current skills and goals when available
+- Suggest concrete next steps
+- Use examples and analogies when explaining concepts
+- Keep responses concise but comprehensive
+- Format responses with markdown for readability
+
+Remember: 76% of students feel current guidance is generic. Make your advice SPECIFIC and PERSONALIZED."""
+
+
+def _sse_event(data: Dict[str, Any], event: Optional[str] = None) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    head = f"event: {event}\n".encode() if event else b""
+    return head + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+@lru_cache(maxsize=2048)
+def _context_prompt(target_role: Optional[str], current_skills: Tuple[str, ...], skill_gaps: Tuple[str, ...]) -> str:
+    """Context section appended to the system prompt, memoized per context."""
+    lines = ["\n\nCurrent Context:"]
+    if target_role:
+        lines.append(f"\n- Target Role: {target_role}")
+    if current_skills:
+        lines.append(f"\n- Current Skills: {', '.join(current_skills)}")
+    if skill_gaps:
+        lines.append(f"\n- Identified Skill Gaps: {', '.join(skill_gaps)}")
+    return "".join(lines)
+
+
 class AdaptiveCareerAgent:
     """
     Adaptive AI agent for personalized career guidance.
     Uses LangChain with OpenAI and integrates with skill knowledge graph.
     """
     
+    HISTORY_WINDOW = 10  # Prior messages sent to the LLM
+    MAX_STORED_MESSAGES = 200  # Older turns are dropped from the conversation document
+    
     def __init__(self):
         """Initialize the AI agent."""
         self.llm = ChatOpenAI(
@@ -40,69 +93,90 @@ class AdaptiveCareerAgent:
         )
         self.skill_graph = SkillKnowledgeGraph()
         self.db = MongoDB.get_database()
+        self.response_cache = get_semantic_cache()
+        # Strong refs to fire-and-forget writes so they aren't collected mid-flight
+        self._pending_writes: Set[asyncio.Task] = set()
         
-    async def _get_conversation_history(self, user_id: str) -> List[ChatMessage]:
-        """Retrieve conversation history from database."""
-        try:
-            conversation = await self.db.conversations.find_one({"user_id": user_id})
-            if conversation:
-                return [ChatMessage(**msg) for msg in conversation.get("messages", [])]
-            return []
-        except Exception as e:
-            logger.error(f"Error retrieving conversation history: {e}")
-            return []
+    @classmethod
+    def _message_update(cls, message: ChatMessage, context: Optional[Dict] = None) -> Dict:
+        """Update document appending a message to a conversation (upserted, capped)."""
+        # The message's own timestamp doubles as updated_at; the stored shape
+        # is fixed, so build it directly instead of going through model_dump()
+        now = message.timestamp
+        stored = {
+            "role": message.role.value,
+            "content": message.content,
+            "timestamp": now,
+            "metadata": message.metadata
+        }
+        return {
+            "$push": {
+                "messages": {
+                    "$each": [stored],
+                    "$slice": -cls.MAX_STORED_MESSAGES
+                }
+            },
+            "$set": {
+                "updated_at": now,
+                "context": context or {}
+            },
+            "$setOnInsert": {"created_at": now}
+        }
     
     async def _save_message(self, user_id: str, message: ChatMessage, context: Optional[Dict] = None):
         """Save message to conversation history."""
         try:
             await self.db.conversations.update_one(
                 {"user_id": user_id},
-                {
-                    "$push": {"messages": message.model_dump()},
-                    "$set": {
-                        "updated_at": datetime.utcnow(),
-                        "context": context or {}
-                    },
-                    "$setOnInsert": {"created_at": datetime.utcnow()}
-                },
+                self._message_update(message, context),
                 upsert=True
             )
         except Exception as e:
             logger.error(f"Error saving message: {e}")
     
+    async def _push_user_message(
+        self,
+        user_id: str,
+        message: ChatMessage,
+        context: Optional[Dict] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Append the user's message and return the HISTORY_WINDOW messages
+        before it, in one round-trip. Messages are the raw stored dicts;
+        only role and content are read, so they skip model validation.
+        Returns None if the write failed and the history is unknown.
+        """
+        try:
+            previous = await self.db.conversations.find_one_and_update(
+                {"user_id": user_id},
+                self._message_update(message, context),
+                projection={"messages": {"$slice": -self.HISTORY_WINDOW}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+            if previous:
+                return previous.get("messages", [])
+            return []
+        except Exception as e:
+            logger.error(f"Error saving message: {e}")
+            return None
+    
+    def _save_message_in_background(self, user_id: str, message: ChatMessage, context: Optional[Dict] = None):
+        """Save a message without making the caller wait for the write."""
+        task = asyncio.create_task(self._save_message(user_id, message, context))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+    
     def _create_system_prompt(self, context: Optional[Dict] = None) -> str:
         """Create system prompt with context."""
-        base_prompt = """You are SkillLens AI, an expert career guidance counselor specializing in helping engineering students prepare for their careers.
-
-Your role is to:
-1. Provide personalized, actionable career advice
-2. Analyze skill gaps and recommend learning paths
-3. Explain technical concepts clearly
-4. Motivate and encourage students
-5. Give specific, data-driven recommendations
-
-Guidelines:
-- Be encouraging and supportive
-- Provide specific, actionable advice (not generic)
-- Reference the student's current skills and goals when available
-- Suggest concrete next steps
-- Use examples and analogies when explaining concepts
-- Keep responses concise but comprehensive
-- Format responses with markdown for readability
-
-Remember: 76% of students feel current guidance is generic. Make your advice SPECIFIC and PERSONALIZED."""
-
-        if context:
-            context_info = "\n\nCurrent Context:"
-            if context.get("target_role"):
-                context_info += f"\n- Target Role: {context['target_role']}"
-            if context.get("current_skills"):
-                context_info += f"\n- Current Skills: {', '.join(context['current_skills'])}"
-            if context.get("skill_gaps"):
-                context_info += f"\n- Identified Skill Gaps: {', '.join(context['skill_gaps'])}"
-            base_prompt += context_info
-        
-        return base_prompt
+        if not context:
+            return _BASE_PROMPT
+        # The static instructions stay a fixed prefix; only the context tail varies
+        return _BASE_PROMPT + _context_prompt(
+            context.get("target_role"),
+            tuple(context.get("current_skills") or ()),
+            tuple(context.get("skill_gaps") or ())
+        )
     
     def _get_skill_info_tool(self) -> Tool:
         """Create tool for querying skill information."""
@@ -163,72 +237,201 @@ Remember: 76% of students feel current guidance is generic. Make your advice SPE
         Returns:
             Agent response with message and metadata
         """
-        try:
-            # Get conversation history
-            history = await self._get_conversation_history(request.user_id)
-            
-            # Save user message
-            user_message = ChatMessage(
-                role=MessageRole.USER,
-                content=request.message,
-                timestamp=datetime.utcnow()
-            )
-            await self._save_message(request.user_id, user_message, request.context)
-            
-            # Create system prompt with context
-            system_prompt = self._create_system_prompt(request.context)
-            
-            # Build message history for LLM
-            messages = [SystemMessage(content=system_prompt)]
-            
-            # Add conversation history (last 10 messages for context)
-            for msg in history[-10:]:
-                if msg.role == MessageRole.USER:
-                    messages.append(HumanMessage(content=msg.content))
-                elif msg.role == MessageRole.ASSISTANT:
-                    messages.append(AIMessage(content=msg.content))
+        response, assistant_message = await self._chat_turn(request)
+        if assistant_message is not None:
+            self._save_message_in_background(request.user_id, assistant_message, request.context)
+        return response
+    
+    async def chat_batch(
+        self,
+        requests: List[ChatRequest],
+        max_concurrency: int = CHAT_BATCH_CONCURRENCY
+    ) -> List[AgentResponse]:
+        """
+        Answer many chat requests (e.g. offline jobs) with bounded LLM
+        concurrency, then save all assistant replies in one bulk write.
+        
+        Args:
+            requests: Chat requests, possibly for different users
+            max_concurrency: Maximum LLM calls in flight at once
             
-            # Add current user message
-            messages.append(HumanMessage(content=request.message))
+        Returns:
+            Agent responses in request order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(request: ChatRequest):
+            async with semaphore:
+                return await self._chat_turn(request)
+        
+        results = await asyncio.gather(*(run(request) for request in requests))
+        
+        # Ordered, so several turns for one user keep their sequence
+        writes = [
+            UpdateOne({"user_id": request.user_id}, self._message_update(message, request.context), upsert=True)
+            for request, (_, message) in zip(requests, results)
+            if message is not None
+        ]
+        if writes:
+            try:
+                await self.db.conversations.bulk_write(writes)
+            except Exception as e:
+                logger.error(f"Error saving batch messages: {e}")
+        
+        return [response for response, _ in results]
+    
+    @staticmethod
+    def _cache_scope(request: ChatRequest, history: List[Dict[str, Any]]) -> Tuple:
+        """
+        Semantic cache scope for a turn: the user, the target role and a
+        digest of the prior messages, so an answer is only reused for the
+        same question asked at the same point in the same conversation.
+        """
+        digest = hashlib.blake2b(
+            orjson.dumps([[msg["role"], msg["content"]] for msg in history]),
+            digest_size=16
+        ).digest()
+        return request.user_id, (request.context or {}).get("target_role"), digest
+    
+    async def _start_turn(self, request: ChatRequest) -> Tuple[Optional[str], Optional[Tuple], Any, Optional[List]]:
+        """
+        Save the user's message and check the semantic cache. Returns the
+        cached reply (or None), the cache scope (None when the history is
+        unknown, so the turn must not be cached), the prompt embedding, and
+        on a miss the message list to send to the LLM.
+        """
+        user_message = ChatMessage(
+            role=MessageRole.USER,
+            content=request.message,
+            timestamp=utc_now()
+        )
+        # Save user message and get the recent history in one round-trip,
+        # overlapped with embedding the prompt for the semantic cache
+        # (near-duplicate questions in the same scope reuse a recent answer)
+        history, prompt_embedding = await asyncio.gather(
+            self._push_user_message(request.user_id, user_message, request.context),
+            self.response_cache.embed(request.message)
+        )
+        if history is None:
+            # Without the history the scope can't be told apart from a fresh
+            # conversation's, so neither reuse nor remember an answer
+            cache_scope = None
+            history = []
+        else:
+            cache_scope = self._cache_scope(request, history)
+            response_content = self.response_cache.match(cache_scope, prompt_embedding)
+            if response_content is not None:
+                return response_content, cache_scope, prompt_embedding, None
+        
+        # Create system prompt with context
+        system_prompt = self._create_system_prompt(request.context)
+        
+        # Build message history for LLM
+        messages = [SystemMessage(content=system_prompt)]
+        
+        # Add conversation history (last HISTORY_WINDOW messages for context)
+        for msg in history:
+            if msg["role"] == MessageRole.USER:
+                messages.append(HumanMessage(content=msg["content"]))
+            elif msg["role"] == MessageRole.ASSISTANT:
+                messages.append(AIMessage(content=msg["content"]))
+        
+        # Add current user message
+        messages.append(HumanMessage(content=request.message))
+        return None, cache_scope, prompt_embedding, messages
+    
+    def _finish_turn(
+        self,
+        request: ChatRequest,
+        response_content: str,
+        cache_hit: bool
+    ) -> Tuple[AgentResponse, ChatMessage]:
+        """Build the response and the assistant message still to be saved."""
+        assistant_message = ChatMessage(
+            role=MessageRole.ASSISTANT,
+            content=response_content,
+            timestamp=utc_now()
+        )
+        
+        # Generate suggestions based on context
+        suggestions = self._generate_suggestions(request.message, request.context)
+        
+        # Check if learning path is available
+        learning_path_available = bool(request.context and request.context.get("skill_gaps"))
+        
+        return AgentResponse(
+            message=response_content,
+            conversation_id=request.user_id,
+            suggestions=suggestions,
+            learning_path_available=learning_path_available,
+            metadata={
+                "model": "gpt-3.5-turbo",
+                "timestamp": assistant_message.timestamp.isoformat(),
+                "cached": cache_hit
+            }
+        ), assistant_message
+    
+    @staticmethod
+    def _error_response(request: ChatRequest, e: Exception) -> AgentResponse:
+        """Response sent when a turn fails."""
+        return AgentResponse(
+            message="I apologize, but I encountered an error processing your request. Please try again.",
+            conversation_id=request.user_id,
+            suggestions=["Try rephrasing your question", "Check your connection"],
+            learning_path_available=False,
+            metadata={"error": str(e)}
+        )
+    
+    async def _chat_turn(self, request: ChatRequest) -> Tuple[AgentResponse, Optional[ChatMessage]]:
+        """Generate one reply; returns the response and the assistant message still to be saved."""
+        try:
+            response_content, cache_scope, prompt_embedding, messages = await self._start_turn(request)
+            cache_hit = response_content is not None
             
-            # Generate response
-            response = await self.llm.ainvoke(messages)
-            response_content = response.content
+            if not cache_hit:
+                # Generate response
+                response = await self.llm.ainvoke(messages)
+                response_content = response.content
+                if cache_scope is not None:
+                    self.response_cache.store(cache_scope, prompt_embedding, response_content)
             
-            # Save assistant message
-            assistant_message = ChatMessage(
-                role=MessageRole.ASSISTANT,
-                content=response_content,
-                timestamp=datetime.utcnow()
-            )
-            await self._save_message(request.user_id, assistant_message, request.context)
+            return self._finish_turn(request, response_content, cache_hit)
             
-            # Generate suggestions based on context
-            suggestions = self._generate_suggestions(request.message, request.context)
+        except Exception as e:
+            logger.error(f"Error in chat: {e}")
+            return self._error_response(request, e), None
+    
+    async def chat_stream(self, request: ChatRequest) -> AsyncIterator[bytes]:
+        """
+        Process a chat message as server-sent events.
+        
+        Emits "data: {"delta": ...}" events as the LLM produces tokens (one
+        event for a cached reply), then a "done" event carrying the rest of
+        the AgentResponse (suggestions, metadata), or an "error" event.
+        """
+        try:
+            response_content, cache_scope, prompt_embedding, messages = await self._start_turn(request)
+            cache_hit = response_content is not None
             
-            # Check if learning path is available
-            learning_path_available = bool(request.context and request.context.get("skill_gaps"))
+            if cache_hit:
+                yield _sse_event({"delta": response_content})
+            else:
+                parts = []
+                async for chunk in self.llm.astream(messages):
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        yield _sse_event({"delta": chunk.content})
+                response_content = "".join(parts)
+                if cache_scope is not None:
+                    self.response_cache.store(cache_scope, prompt_embedding, response_content)
             
-            return AgentResponse(
-                message=response_content,
-                conversation_id=request.user_id,
-                suggestions=suggestions,
-                learning_path_available=learning_path_available,
-                metadata={
-                    "model": "gpt-3.5-turbo",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            )
+            response, assistant_message = self._finish_turn(request, response_content, cache_hit)
+            self._save_message_in_background(request.user_id, assistant_message, request.context)
+            yield _sse_event(response.model_dump(mode="json", exclude={"message"}), event="done")
             
         except Exception as e:
-            logger.error(f"Error in chat: {e}")
-            return AgentResponse(
-                message="I apologize, but I encountered an error processing your request. Please try again.",
-                conversation_id=request.user_id,
-                suggestions=["Try rephrasing your question", "Check your connection"],
-                learning_path_available=False,
-                metadata={"error": str(e)}
-            )
+            logger.error(f"Error in chat stream: {e}")
+            yield _sse_event(self._error_response(request, e).model_dump(mode="json"), event="error")
     
     def _generate_suggestions(self, message: str, context: Optional[Dict]) -> List[str]:
         """Generate contextual suggestions for next questions."""
@@ -262,13 +465,14 @@ Remember: 76% of students feel current guidance is generic. Make your advice SPE
         try:
             conversation = await self.db.conversations.find_one({"user_id": user_id})
             if conversation:
+                now = datetime.utcnow()
                 return ConversationHistory(
                     user_id=conversation["user_id"],
                     conversation_id=conversation.get("_id", user_id),
                     messages=[ChatMessage(**msg) for msg in conversation.get("messages", [])],
                     context=ConversationContext(**conversation.get("context", {"user_id": user_id})),
-                    created_at=conversation.get("created_at", datetime.utcnow()),
-                    updated_at=conversation.get("updated_at", datetime.utcnow())
+                    created_at=conversation.get("created_at", now),
+                    updated_at=conversation.get("updated_at", now)
                 )
             return None
         except Exception as e:
@@ -287,10 +491,13 @@ Remember: 76% of students feel current guidance is generic. Make your advice SPE
 
 # Singleton instance
 _agent_instance = None
+_agent_lock = threading.Lock()
 
 def get_agent() -> AdaptiveCareerAgent:
     """Get singleton instance of the agent."""
     global _agent_instance
     if _agent_instance is None:
-        _agent_instance = AdaptiveCareerAgent()
+        with _agent_lock:
+            if _agent_instance is None:
+                _agent_instance = AdaptiveCareerAgent()
     return _agent_instance
@@ -4,18 +4,28 @@ JWT-based authentication with user registration and login.
 Updated to use PostgreSQL with SQLAlchemy.
 """
 
+import asyncio
+import base64
+import hashlib
+import hmac
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
 import bcrypt
 import jwt
+import orjson
 import uuid
 
 from app.config import settings
 from app.database import User as UserModel, create_session
-from sqlalchemy import select
+from app.services.cpu_pool import run_cpu_bound
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
 logger = logging.getLogger(__name__)
 
@@ -47,8 +57,7 @@ class User(BaseModel):
     created_at: datetime
     is_active: bool = True
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -60,7 +69,7 @@ class Token(BaseModel):
 
 def get_password_hash(password: str) -> str:
     """Hash password using bcrypt."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -70,22 +79,162 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
+def _user_from_model(user_model: UserModel) -> User:
+    """Build the response model from a users row."""
+    return User(
+        user_id=str(user_model.id),
+        email=user_model.email,
+        full_name=user_model.full_name,
+        role=user_model.role,
+        department=user_model.department,
+        register_number=user_model.register_number,
+        created_at=user_model.created_at,
+        is_active=user_model.is_active
+    )
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url, as used in JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
 class AuthService:
     """Authentication service with JWT and PostgreSQL."""
     
+    TOKEN_CACHE_SIZE = 4096
+    TOKEN_CACHE_TTL = 60  # seconds; bounds how long a deactivation can go unnoticed
+    USER_CACHE_SIZE = 10_000
+    USER_CACHE_TTL = 30  # seconds
+    LOGIN_CACHE_SIZE = 10_000
+    LOGIN_CACHE_TTL = 60  # seconds
+    
     def __init__(self):
         """Initialize auth service."""
         self.secret_key = settings.secret_key if hasattr(settings, 'secret_key') else settings.jwt_secret
         self.algorithm = settings.jwt_algorithm
         self.access_token_expire_minutes = settings.jwt_expiration_minutes
+        
+        # HS256 tokens are signed directly with a precomputed key and header
+        self._hs256_key = self.secret_key.encode('utf-8')
+        self._hs256_header = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+        
+        # Hot-token cache: sha256(token) -> (user, monotonic expiry), least recently used first
+        self._token_cache: "OrderedDict[bytes, Tuple[User, float]]" = OrderedDict()
+        
+        # User rows by id: user_id -> (user, monotonic expiry), plus in-flight
+        # lookups so concurrent misses for one user share a single query
+        self._user_cache: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self._user_loads: Dict[str, asyncio.Future] = {}
+        
+        # Recently verified logins: HMAC(email, password) -> (stored hash, monotonic expiry).
+        # The HMAC key is per-process, so entries are useless outside this
+        # process and plaintext passwords are never kept.
+        self._login_cache_key = secrets.token_bytes(32)
+        self._verified_logins: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+    
+    def _cache_user(self, key: bytes, user: User, token_exp: Optional[float]):
+        """Remember a verified token until min(TTL, token expiry)."""
+        ttl = self.TOKEN_CACHE_TTL
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        if len(self._token_cache) >= self.TOKEN_CACHE_SIZE:
+            self._token_cache.popitem(last=False)
+        self._token_cache[key] = (user, time.monotonic() + ttl)
+    
+    def invalidate_user(self, user_id: str):
+        """
+        Drop cached tokens and the cached row for a user (e.g. after a profile
+        change or deactivation). Only this process's caches are cleared;
+        other workers catch up within their cache TTLs.
+        """
+        for key in [k for k, (user, _) in self._token_cache.items() if user.user_id == user_id]:
+            del self._token_cache[key]
+        self._user_cache.pop(user_id, None)
+    
+    def _remember_user(self, user: User):
+        """Cache a user row for USER_CACHE_TTL."""
+        self._user_cache.pop(user.user_id, None)
+        if len(self._user_cache) >= self.USER_CACHE_SIZE:
+            self._user_cache.popitem(last=False)
+        self._user_cache[user.user_id] = (user, time.monotonic() + self.USER_CACHE_TTL)
+    
+    async def _load_user(self, user_uuid: uuid.UUID, db: Optional[AsyncSession] = None) -> Optional[User]:
+        """
+        Fetch a user by id through the cache; concurrent misses wait on one query.
+        
+        Without ``db`` a miss runs on a short-lived session that is closed
+        before returning, so callers don't hold a pooled connection.
+        """
+        key = str(user_uuid)
+        cached = self._user_cache.get(key)
+        if cached is not None:
+            user, expires_at = cached
+            if expires_at > time.monotonic():
+                self._user_cache.move_to_end(key)
+                return user
+            del self._user_cache[key]
+        
+        pending = self._user_loads.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._user_loads[key] = future
+        user = None
+        try:
+            query = select(UserModel).where(UserModel.id == user_uuid)
+            if db is None:
+                async with await create_session() as session:
+                    user_model = (await session.execute(query)).scalar_one_or_none()
+            else:
+                user_model = (await db.execute(query)).scalar_one_or_none()
+            if user_model:
+                user = _user_from_model(user_model)
+                self._remember_user(user)
+            return user
+        finally:
+            # Waiters see None if the query failed, same as the caller
+            del self._user_loads[key]
+            future.set_result(user)
+    
+    async def _check_password(self, email: str, password: str, hashed_password: str) -> bool:
+        """
+        Verify a login password, skipping bcrypt when the same credentials
+        were verified against the same stored hash within LOGIN_CACHE_TTL.
+        Failed attempts are never cached, so guessing still pays the full KDF.
+        """
+        key = hmac.new(
+            self._login_cache_key,
+            f"{email}\0{password}".encode('utf-8'),
+            hashlib.sha256
+        ).digest()
+        cached = self._verified_logins.get(key)
+        if cached is not None:
+            cached_hash, expires_at = cached
+            if cached_hash == hashed_password and expires_at > time.monotonic():
+                self._verified_logins.move_to_end(key)
+                return True
+            del self._verified_logins[key]
+        
+        if not await run_cpu_bound(verify_password, password, hashed_password):
+            return False
+        
+        if len(self._verified_logins) >= self.LOGIN_CACHE_SIZE:
+            self._verified_logins.popitem(last=False)
+        self._verified_logins[key] = (hashed_password, time.monotonic() + self.LOGIN_CACHE_TTL)
+        return True
     
     def _create_access_token(self, data: dict) -> str:
         """Create JWT access token."""
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(minutes=self.access_token_expire_minutes)
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
+        exp = int(time.time()) + self.access_token_expire_minutes * 60
+        if self.algorithm != "HS256":
+            return jwt.encode({**data, "exp": exp}, self.secret_key, algorithm=self.algorithm)
+        
+        signing_input = self._hs256_header + b"." + _b64url(orjson.dumps({**data, "exp": exp}))
+        signature = hmac.new(self._hs256_key, signing_input, hashlib.sha256).digest()
+        return (signing_input + b"." + _b64url(signature)).decode('ascii')
     
     async def register_user(self, user_data: UserCreate, db: AsyncSession) -> Token:
         """
@@ -111,7 +260,7 @@ class AuthService:
             # Create new user
             new_user = UserModel(
                 email=user_data.email,
-                hashed_password=get_password_hash(user_data.password),
+                hashed_password=await run_cpu_bound(get_password_hash, user_data.password),
                 full_name=user_data.full_name,
                 role=user_data.role,
                 department=user_data.department,
@@ -129,17 +278,9 @@ class AuthService:
                 "email": new_user.email
             })
             
-            # Return token and user
-            user = User(
-                user_id=str(new_user.id),
-                email=new_user.email,
-                full_name=new_user.full_name,
-                role=new_user.role,
-                department=new_user.department,
-                register_number=new_user.register_number,
-                created_at=new_user.created_at,
-                is_active=new_user.is_active
-            )
+            # Return token and user; the first authenticated request will want it too
+            user = _user_from_model(new_user)
+            self._remember_user(user)
             
             return Token(access_token=access_token, user=user)
             
@@ -171,7 +312,7 @@ class AuthService:
                 raise ValueError("Invalid email or password")
             
             # Verify password
-            if not verify_password(login_data.password, user_model.hashed_password):
+            if not await self._check_password(login_data.email, login_data.password, user_model.hashed_password):
                 raise ValueError("Invalid email or password")
             
             # Check if user is active
@@ -184,17 +325,9 @@ class AuthService:
                 "email": user_model.email
             })
             
-            # Return token and user
-            user = User(
-                user_id=str(user_model.id),
-                email=user_model.email,
-                full_name=user_model.full_name,
-                role=user_model.role,
-                department=user_model.department,
-                register_number=user_model.register_number,
-                created_at=user_model.created_at,
-                is_active=user_model.is_active
-            )
+            # Return token and user; the first authenticated request will want it too
+            user = _user_from_model(user_model)
+            self._remember_user(user)
             
             return Token(access_token=access_token, user=user)
             
@@ -204,17 +337,27 @@ class AuthService:
             logger.error(f"Error logging in user: {e}")
             raise Exception("Failed to login")
     
-    async def verify_token(self, token: str, db: AsyncSession) -> Optional[User]:
+    async def verify_token(self, token: str, db: Optional[AsyncSession] = None) -> Optional[User]:
         """
         Verify JWT token and return user.
         
         Args:
             token: JWT access token
-            db: Database session
+            db: Database session; a short-lived one is used if omitted
             
         Returns:
             User if valid, None otherwise
         """
+        # Repeat requests with the same bearer token skip decode and lookup
+        cache_key = hashlib.sha256(token.encode('utf-8')).digest()
+        cached = self._token_cache.get(cache_key)
+        if cached is not None:
+            user, expires_at = cached
+            if expires_at > time.monotonic():
+                self._token_cache.move_to_end(cache_key)
+                return user
+            del self._token_cache[cache_key]
+        
         try:
             # Decode token
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
@@ -229,58 +372,49 @@ class AuthService:
             except ValueError:
                 return None
             
-            # Get user from database
-            result = await db.execute(
-                select(UserModel).where(UserModel.id == user_id)
-            )
-            user_model = result.scalar_one_or_none()
-            
-            if not user_model:
+            # Get user (cached by id, then database)
+            user = await self._load_user(user_id, db)
+            if user is None:
                 return None
             
-            return User(
-                user_id=str(user_model.id),
-                email=user_model.email,
-                full_name=user_model.full_name,
-                role=user_model.role,
-                department=user_model.department,
-                register_number=user_model.register_number,
-                created_at=user_model.created_at,
-                is_active=user_model.is_active
-            )
+            self._cache_user(cache_key, user, payload.get("exp"))
+            return user
             
         except jwt.ExpiredSignatureError:
             logger.warning("Token expired")
             return None
-        except jwt.JWTError as e:
+        except jwt.InvalidTokenError as e:
             logger.warning(f"Invalid token: {e}")
             return None
         except Exception as e:
             logger.error(f"Error verifying token: {e}")
             return None
     
+    async def set_user_active(self, user_id: str, is_active: bool, db: AsyncSession) -> bool:
+        """Activate or deactivate a user. Returns False if the user doesn't exist."""
+        result = await db.execute(
+            update(UserModel).where(UserModel.id == uuid.UUID(user_id)).values(is_active=is_active)
+        )
+        await db.commit()
+        # Deactivation must not keep working from cached tokens or rows
+        self.invalidate_user(user_id)
+        return result.rowcount > 0
+    
+    async def change_password(self, user_id: str, new_password: str, db: AsyncSession) -> bool:
+        """Replace a user's password hash. Returns False if the user doesn't exist."""
+        hashed_password = await run_cpu_bound(get_password_hash, new_password)
+        result = await db.execute(
+            update(UserModel).where(UserModel.id == uuid.UUID(user_id)).values(hashed_password=hashed_password)
+        )
+        await db.commit()
+        # Cached logins are tied to the old hash and stop matching on their own
+        self.invalidate_user(user_id)
+        return result.rowcount > 0
+    
     async def get_user_by_id(self, user_id: str, db: AsyncSession) -> Optional[User]:
         """Get user by ID."""
         try:
-            user_uuid = uuid.UUID(user_id)
-            result = await db.execute(
-                select(UserModel).where(UserModel.id == user_uuid)
-            )
-            user_model = result.scalar_one_or_none()
-            
-            if not user_model:
-                return None
-            
-            return User(
-                user_id=str(user_model.id),
-                email=user_model.email,
-                full_name=user_model.full_name,
-                role=user_model.role,
-                department=user_model.department,
-                register_number=user_model.register_number,
-                created_at=user_model.created_at,
-                is_active=user_model.is_active
-            )
+            return await self._load_user(uuid.UUID(user_id), db)
         except Exception as e:
             logger.error(f"Error getting user: {e}")
             return None
@@ -288,10 +422,13 @@ class AuthService:
 
 # Singleton instance
 _auth_service = None
+_auth_service_lock = threading.Lock()
 
 def get_auth_service() -> AuthService:
     """Get singleton instance of auth service."""
     global _auth_service
     if _auth_service is None:
-        _auth_service = AuthService()
+        with _auth_service_lock:
+            if _auth_service is None:
+                _auth_service = AuthService()
     return _auth_service
@@ -0,0 +1,116 @@
+"""
+CPU Pool Service
+Process pools for CPU-bound work so it doesn't stall the event loop or
+Starlette's threadpool: one for trusted work (password hashing) and a
+separate one for parsing untrusted documents, so a hostile or huge file
+can only tie up (or crash) parse workers, never login.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _LazyProcessPool:
+    """A ProcessPoolExecutor created on first use and replaced when it breaks."""
+
+    def __init__(self, name: str, max_workers: int, retry_broken: bool):
+        self.name = name
+        self.max_workers = max(1, min(max_workers, os.cpu_count() or 1))
+        self.retry_broken = retry_broken
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ProcessPoolExecutor:
+        """Get the pool, starting it on first use."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn, not fork: by now the parent runs model and driver
+                    # threads, and a forked child would inherit their held locks
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                    logger.info(f"Started {self.name} process pool with {self.max_workers} workers")
+        return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool so the next get() starts a fresh one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                logger.warning(f"{self.name} process pool broke (worker died); restarting it")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Run func(*args) in the pool. If a worker dies (crash, OOM kill) the
+        pool is replaced so one bad job doesn't break every later caller.
+        With retry_broken the call is then retried once; without it the
+        BrokenProcessPool is raised, so an input that kills workers is never
+        resubmitted to the fresh pool.
+        """
+        loop = asyncio.get_running_loop()
+        attempts = 2 if self.retry_broken else 1
+        for attempt in range(attempts):
+            pool = self.get()
+            try:
+                return await loop.run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                self._discard(pool)
+                if attempt == attempts - 1:
+                    raise
+
+    def shutdown(self):
+        """Shut the pool down, if it was started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Trusted jobs are retried after a worker death; an untrusted document that
+# crashed a worker could well crash the next one too
+_cpu_pool = _LazyProcessPool("CPU", settings.cpu_pool_workers, retry_broken=True)
+_parse_pool = _LazyProcessPool("Parse", settings.parse_pool_workers, retry_broken=False)
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Get the process pool for trusted CPU-bound work, created on first use."""
+    return _cpu_pool.get()
+
+
+async def run_cpu_bound(func: Callable, *args: Any) -> Any:
+    """
+    Run a CPU-bound function (e.g. bcrypt) in the trusted process pool.
+
+    func and args must be picklable (module-level functions or static methods).
+    """
+    return await _cpu_pool.run(func, *args)
+
+
+async def run_parse_bound(func: Callable, *args: Any) -> Any:
+    """
+    Run document parsing of untrusted input in its own bounded process pool.
+
+    Raises BrokenProcessPool (without retrying) if the job's worker dies.
+
+    func and args must be picklable (module-level functions or static methods).
+    """
+    return await _parse_pool.run(func, *args)
+
+
+def shutdown_cpu_pool():
+    """Shut down both process pools, if they were started."""
+    _cpu_pool.shutdown()
+    _parse_pool.shutdown()
@@ -0,0 +1,65 @@
+"""
+Document Text Extraction
+Plain-text extraction from PDF and DOCX resumes, run in the parse process
+pool. Kept free of model imports (torch, transformers) so that spawning a
+parse worker only loads the document libraries.
+"""
+
+import logging
+
+import docx
+
+try:
+    import pypdfium2 as pdfium  # PDFium (C++) text extraction
+except ImportError:  # No native wheel; fall back to pure-Python PyPDF2
+    pdfium = None
+    import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+
+def extract_text(file_path: str, file_type: str) -> str:
+    """Extract text from a PDF or DOCX file; empty string if it can't be read."""
+    try:
+        if file_type.lower() == 'pdf':
+            return extract_from_pdf(file_path)
+        elif file_type.lower() in ['docx', 'doc']:
+            return extract_from_docx(file_path)
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+    except Exception as e:
+        logger.error(f"Error extracting text: {e}")
+        return ""
+
+
+def extract_from_pdf(file_path: str) -> str:
+    """Extract text from PDF"""
+    text = ""
+    try:
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                text = "\n".join(page.get_textpage().get_text_range() for page in pdf)
+            finally:
+                pdf.close()
+            # PDFium ends lines with \r\n; the section regexes split on \n
+            text = text.replace("\r\n", "\n")
+        else:
+            with open(file_path, 'rb') as file:
+                pdf_reader = PyPDF2.PdfReader(file)
+                # Join once rather than growing a string page by page
+                text = "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
+    except Exception as e:
+        logger.error(f"PDF extraction error: {e}")
+    return text.strip()
+
+
+def extract_from_docx(file_path: str) -> str:
+    """Extract text from DOCX"""
+    text = ""
+    try:
+        doc = docx.Document(file_path)
+        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
+    except Exception as e:
+        logger.error(f"DOCX extraction error: {e}")
+    return text.strip()
@@ -3,21 +3,64 @@ File Upload Service
 Handles resume file uploads with validation and storage.
 """
 
+import asyncio
+import hashlib
 import logging
 import os
+import threading
 import uuid
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
 from fastapi import UploadFile
-import PyPDF2
 from docx import Document
+from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # Fall back to the pure-Python reader
+    pdfium = None
+    import PyPDF2
 
 from app.database import MongoDB
+from app.services.cpu_pool import run_parse_bound
 
 logger = logging.getLogger(__name__)
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# PDFs longer than this are split into page ranges extracted in parallel
+PDF_PAGES_PER_TASK = 8
+
+
+def _pdf_page_count(file_path: str) -> int:
+    """Number of pages in a PDF (runs in the parse pool)."""
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with open(file_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> str:
+    """Extract text from pages [start, stop) of a PDF (runs in the parse pool)."""
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            text = "\n".join(pdf[i].get_textpage().get_text_range() for i in range(start, stop))
+        finally:
+            pdf.close()
+        # PDFium ends lines with \r\n
+        return text.replace("\r\n", "\n")
+    with open(file_path, 'rb') as file:
+        pages = PyPDF2.PdfReader(file).pages[start:stop]
+        return "\n".join(page.extract_text() or "" for page in pages)
+
 
 class FileUploadService:
     """Service for handling file uploads."""
@@ -47,20 +90,22 @@ class FileUploadService:
         # File size will be checked during read
         return True, ""
     
-    def _extract_text_from_pdf(self, file_path: Path) -> str:
-        """Extract text from PDF file."""
+    async def _extract_text_from_pdf(self, file_path: Path) -> str:
+        """Extract text from PDF file in the parse pool, page ranges in parallel."""
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
+            path = str(file_path)
+            page_count = await run_parse_bound(_pdf_page_count, path)
+            parts = await asyncio.gather(*(
+                run_parse_bound(_extract_pdf_pages, path, start, min(start + PDF_PAGES_PER_TASK, page_count))
+                for start in range(0, page_count, PDF_PAGES_PER_TASK)
+            ))
+            return "\n".join(parts).strip()
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             raise Exception("Failed to extract text from PDF")
     
-    def _extract_text_from_docx(self, file_path: Path) -> str:
+    @staticmethod
+    def _extract_text_from_docx(file_path: Path) -> str:
         """Extract text from DOCX file."""
         try:
             doc = Document(file_path)
@@ -70,7 +115,8 @@ class FileUploadService:
             logger.error(f"Error extracting text from DOCX: {e}")
             raise Exception("Failed to extract text from DOCX")
     
-    def _extract_text_from_txt(self, file_path: Path) -> str:
+    @staticmethod
+    def _extract_text_from_txt(file_path: Path) -> str:
         """Extract text from TXT file."""
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
@@ -79,6 +125,26 @@ class FileUploadService:
             logger.error(f"Error reading TXT file: {e}")
             raise Exception("Failed to read TXT file")
     
+    async def _find_duplicate(self, user_id: str, content_sha256: str) -> Optional[dict]:
+        """Find a stored upload of the same content by this user."""
+        return await self.db.resumes.find_one(
+            {"user_id": user_id, "content_sha256": content_sha256},
+            projection={"resume_id": 1, "filename": 1, "file_size": 1, "text_content": 1, "uploaded_at": 1}
+        )
+    
+    @staticmethod
+    def _upload_summary(resume_doc: dict) -> dict:
+        """Upload response for a stored resume document."""
+        text = resume_doc["text_content"]
+        return {
+            "resume_id": resume_doc["resume_id"],
+            "filename": resume_doc["filename"],
+            "file_size": resume_doc["file_size"],
+            "text_length": len(text),
+            "uploaded_at": resume_doc["uploaded_at"],
+            "text_preview": text[:500] + "..." if len(text) > 500 else text
+        }
+    
     async def upload_resume(self, file: UploadFile, user_id: str) -> dict:
         """
         Upload and process resume file.
@@ -102,24 +168,38 @@ class FileUploadService:
             filename = f"{resume_id}{file_ext}"
             file_path = self.upload_dir / filename
             
-            # Read and save file
-            content = await file.read()
+            # Stream file to disk in chunks, enforcing the size limit and
+            # hashing the content as we go
+            file_size = 0
+            content_hash = hashlib.sha256()
+            try:
+                with open(file_path, 'wb') as f:
+                    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                        file_size += len(chunk)
+                        if file_size > self.max_file_size:
+                            raise ValueError(f"File size exceeds {self.max_file_size / 1024 / 1024}MB limit")
+                        content_hash.update(chunk)
+                        await run_in_threadpool(f.write, chunk)
+            except BaseException:
+                # Size-limit aborts, read/write errors and client disconnects
+                # (cancellation) must not leave a partial file behind
+                file_path.unlink(missing_ok=True)
+                raise
             
-            # Check file size
-            if len(content) > self.max_file_size:
-                raise ValueError(f"File size exceeds {self.max_file_size / 1024 / 1024}MB limit")
+            # Re-uploading the same file returns the stored copy
+            content_sha256 = content_hash.hexdigest()
+            existing = await self._find_duplicate(user_id, content_sha256)
+            if existing is not None:
+                file_path.unlink(missing_ok=True)
+                return self._upload_summary(existing)
             
-            # Save file
-            with open(file_path, 'wb') as f:
-                f.write(content)
-            
-            # Extract text based on file type
+            # Extract text based on file type, off the event loop
             if file_ext == '.pdf':
-                text = self._extract_text_from_pdf(file_path)
+                text = await self._extract_text_from_pdf(file_path)
             elif file_ext in ['.docx', '.doc']:
-                text = self._extract_text_from_docx(file_path)
+                text = await run_parse_bound(FileUploadService._extract_text_from_docx, file_path)
             elif file_ext == '.txt':
-                text = self._extract_text_from_txt(file_path)
+                text = await run_in_threadpool(FileUploadService._extract_text_from_txt, file_path)
             else:
                 raise ValueError(f"Unsupported file type: {file_ext}")
             
@@ -129,23 +209,22 @@ class FileUploadService:
                 "user_id": user_id,
                 "filename": file.filename,
                 "file_path": str(file_path),
-                "file_size": len(content),
+                "file_size": file_size,
                 "file_type": file_ext,
+                "content_sha256": content_sha256,
                 "text_content": text,
                 "uploaded_at": datetime.utcnow(),
                 "processed": False
             }
             
-            await self.db.resumes.insert_one(resume_doc)
+            try:
+                await self.db.resumes.insert_one(resume_doc)
+            except DuplicateKeyError:
+                # A concurrent upload of the same file won the race
+                file_path.unlink(missing_ok=True)
+                resume_doc = await self._find_duplicate(user_id, content_sha256)
             
-            return {
-                "resume_id": resume_id,
-                "filename": file.filename,
-                "file_size": len(content),
-                "text_length": len(text),
-                "uploaded_at": resume_doc["uploaded_at"],
-                "text_preview": text[:500] + "..." if len(text) > 500 else text
-            }
+            return self._upload_summary(resume_doc)
             
         except ValueError as e:
             raise e
@@ -202,10 +281,13 @@ class FileUploadService:
 
 # Singleton instance
 _upload_service = None
+_upload_service_lock = threading.Lock()
 
 def get_upload_service() -> FileUploadService:
     """Get singleton instance of upload service."""
     global _upload_service
     if _upload_service is None:
-        _upload_service = FileUploadService()
+        with _upload_service_lock:
+            if _upload_service is None:
+                _upload_service = FileUploadService()
     return _upload_service
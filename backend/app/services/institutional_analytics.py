@@ -4,7 +4,7 @@ Provides analytics for placement cells and departments.
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from datetime import datetime, timedelta
 import random
 
@@ -153,22 +153,25 @@ class InstitutionalAnalytics:
             logger.error(f"Error getting skill gap analysis: {e}")
             return {}
     
+    async def iter_timeline_days(self, days: int = 30) -> AsyncIterator[Dict]:
+        """Yield daily metrics for the past N days, oldest first."""
+        # Generate mock timeline data
+        base_date = datetime.utcnow() - timedelta(days=days)
+        
+        for i in range(days):
+            date = base_date + timedelta(days=i)
+            yield {
+                "date": date.strftime("%Y-%m-%d"),
+                "active_users": random.randint(50, 150),
+                "resumes_uploaded": random.randint(5, 25),
+                "assessments_taken": random.randint(10, 40),
+                "ai_interactions": random.randint(30, 100)
+            }
+    
     async def get_timeline_analytics(self, days: int = 30) -> Dict:
         """Get time-series analytics for the past N days."""
         try:
-            # Generate mock timeline data
-            timeline = []
-            base_date = datetime.utcnow() - timedelta(days=days)
-            
-            for i in range(days):
-                date = base_date + timedelta(days=i)
-                timeline.append({
-                    "date": date.strftime("%Y-%m-%d"),
-                    "active_users": random.randint(50, 150),
-                    "resumes_uploaded": random.randint(5, 25),
-                    "assessments_taken": random.randint(10, 40),
-                    "ai_interactions": random.randint(30, 100)
-                })
+            timeline = [day async for day in self.iter_timeline_days(days)]
             
             return {
                 "timeline": timeline,
@@ -230,30 +230,55 @@ class PredictiveModel:
         Returns:
             Batch prediction response with ranked jobs
         """
-        predictions = []
+        job_descriptions = request.job_descriptions
         
-        for jd in request.job_descriptions:
-            single_request = PredictionRequest(
-                resume_text=request.resume_text,
-                job_description=jd,
-                user_skills=request.user_skills,
-                experience_years=request.experience_years
-            )
-            
-            pred = await self.predict_shortlist_probability(single_request)
+        # Same default the single-prediction path returns without a model or on error
+        probabilities = [50.0] * len(job_descriptions)
+        confidences = ["Low"] * len(job_descriptions)
+        
+        if self.model is not None and job_descriptions:
+            # Extract per job so one malformed item keeps the default
+            # instead of failing the whole batch
+            rows = []
+            valid = []
+            for i, jd in enumerate(job_descriptions):
+                try:
+                    rows.append(self._extract_features(
+                        request.resume_text or "",
+                        jd,
+                        request.user_skills,
+                        request.experience_years
+                    ))
+                    valid.append(i)
+                except Exception as e:
+                    logger.error(f"Error extracting features for batch item {i}: {e}")
             
-            predictions.append({
+            # Score every valid row in one predict_proba call
+            if rows:
+                features = np.vstack(rows)
+                try:
+                    raw = self.model.predict_proba(features)[:, 1]  # Probability of class 1 (shortlisted)
+                    for row, (i, p) in enumerate(zip(valid, raw.tolist())):
+                        probabilities[i] = round(p * 100, 1)
+                        confidences[i] = self._get_confidence_level(p, features[row:row + 1])
+                except Exception as e:
+                    logger.error(f"Error in batch prediction: {e}")
+        
+        predictions = [
+            {
                 'job_description': jd,
-                'probability': pred.shortlist_probability,
-                'confidence': pred.confidence
-            })
+                'probability': probability,
+                'confidence': confidence
+            }
+            for jd, probability, confidence in zip(job_descriptions, probabilities, confidences)
+        ]
         
         # Sort by probability
         predictions.sort(key=lambda x: x['probability'], reverse=True)
         
-        # Add ranks
+        # Add ranks (internal values, so skip validation)
         job_predictions = [
-            JobPrediction(
+            JobPrediction.model_construct(
                 job_description=p['job_description'],
                 shortlist_probability=p['probability'],
                 confidence=p['confidence'],
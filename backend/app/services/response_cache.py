@@ -0,0 +1,168 @@
+"""
+Response Cache Service
+TTL cache for slow-changing endpoint payloads.
+Uses Redis when REDIS_URL is configured, otherwise an in-process store.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Namespaced cache of pre-serialized JSON bodies.
+    Keys look like "<namespace>:<endpoint>:<params>" so a whole namespace
+    can be invalidated at once from write paths.
+    """
+    
+    MAX_MEMORY_ENTRIES = 1024
+    
+    def __init__(self, redis_url: Optional[str] = None, default_ttl: int = 3600):
+        """Initialize the cache, connecting to Redis lazily if a URL is given."""
+        self.default_ttl = default_ttl
+        self._memory: Dict[str, Tuple[float, bytes]] = {}
+        self._redis = None
+        
+        if redis_url:
+            # Optional dependency, only needed when Redis is configured
+            import redis.asyncio as redis
+            self._redis = redis.from_url(redis_url)
+            logger.info("Response cache using Redis backend")
+        else:
+            logger.info("Response cache using in-memory backend")
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for a key, or None on miss."""
+        if self._redis is not None:
+            try:
+                return await self._redis.get(key)
+            except Exception as e:
+                logger.warning(f"Redis cache get failed: {e}")
+                return None
+        
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, body = entry
+        if expires_at <= time.monotonic():
+            del self._memory[key]
+            return None
+        return body
+    
+    async def set(self, key: str, body: bytes, ttl: Optional[int] = None):
+        """Store a body under a key for ttl seconds."""
+        ttl = ttl or self.default_ttl
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, body, ex=ttl)
+            except Exception as e:
+                logger.warning(f"Redis cache set failed: {e}")
+            return
+        
+        now = time.monotonic()
+        if len(self._memory) >= self.MAX_MEMORY_ENTRIES:
+            # Drop expired entries first, then the oldest insertion
+            for stale in [k for k, (exp, _) in self._memory.items() if exp <= now]:
+                del self._memory[stale]
+            if len(self._memory) >= self.MAX_MEMORY_ENTRIES:
+                del self._memory[next(iter(self._memory))]
+        self._memory[key] = (now + ttl, body)
+    
+    async def clear(self, namespace: str):
+        """Invalidate every entry in a namespace."""
+        prefix = f"{namespace}:"
+        if self._redis is not None:
+            try:
+                keys = [key async for key in self._redis.scan_iter(match=f"{prefix}*")]
+                if keys:
+                    await self._redis.delete(*keys)
+            except Exception as e:
+                logger.warning(f"Redis cache clear failed: {e}")
+            return
+        
+        for key in [k for k in self._memory if k.startswith(prefix)]:
+            del self._memory[key]
+    
+    async def close(self):
+        """Close the Redis connection pool, if any."""
+        if self._redis is not None:
+            await self._redis.close()
+
+
+def _etag(body: bytes) -> str:
+    """Weak validator for a cached body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (a list of tags or "*") against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: the W/ prefix is ignored on both sides
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def cached(namespace: str, expire: Optional[int] = None) -> Callable:
+    """
+    Cache a route's JSON result, keyed by endpoint name and query parameters.
+    
+    The wrapped route must return JSON-serializable data; cache hits are
+    served as the stored bytes without re-running the route. Empty results
+    and raised errors are never stored. Responses carry an ETag of the body,
+    and a matching If-None-Match gets an empty 304.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(_cache_request: Request, **kwargs):
+            cache = get_response_cache()
+            params = "&".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+            key = f"{namespace}:{func.__name__}:{params}"
+            
+            body = await cache.get(key)
+            if body is None:
+                result = await func(**kwargs)
+                body = orjson.dumps(result)
+                # Services return an empty payload when they fail; serve it,
+                # but don't pin it (and its ETag) for the whole TTL
+                if result:
+                    await cache.set(key, body, expire)
+            
+            # ETag and body come from the same cached snapshot; no-cache makes
+            # clients revalidate, so write-path invalidation is seen promptly
+            headers = {"ETag": _etag(body), "Cache-Control": "no-cache"}
+            if _etag_matches(_cache_request.headers.get("if-none-match"), headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+        
+        # Expose the route's own parameters plus the request to FastAPI
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            inspect.Parameter("_cache_request", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=Request),
+            *signature.parameters.values(),
+        ])
+        return wrapper
+    return decorator
+
+
+# Singleton instance
+_response_cache = None
+
+def get_response_cache() -> ResponseCache:
+    """Get singleton instance of the response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(settings.redis_url, settings.analytics_cache_ttl)
+    return _response_cache
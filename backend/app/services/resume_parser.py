@@ -5,15 +5,18 @@ Extracts skills, experience, projects, and generates embeddings.
 
 import re
 import logging
+import threading
 from typing import List, Dict, Optional
 from pathlib import Path
 
+import numpy as np
 import PyPDF2
 import docx
-from sentence_transformers import SentenceTransformer
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
-from app.models.resume import ResumeData, Experience, Project, Education
+from app.models.resume import ResumeData, Experience, Project, Education, quantize_int8
+from app.services.cpu_pool import run_parse_bound
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +25,15 @@ class ResumeParser:
     """Resume parsing service with semantic skill extraction."""
     
     def __init__(self):
-        """Initialize the resume parser with Sentence-BERT model."""
+        """Initialize the resume parser. The Sentence-BERT model loads on first use."""
         self.model = None
-        self._load_model()
+        self._model_lock = threading.Lock()
     
     def _load_model(self):
         """Load Sentence-BERT model for embeddings."""
+        # Imported here so importing the app doesn't pull in torch
+        from sentence_transformers import SentenceTransformer
+        
         try:
             logger.info(f"Loading model: {settings.sentence_bert_model}")
             self.model = SentenceTransformer(settings.sentence_bert_model)
@@ -36,20 +42,28 @@ class ResumeParser:
             logger.error(f"Failed to load Sentence-BERT model: {e}")
             raise
     
-    def extract_text_from_pdf(self, file_path: str) -> str:
+    def get_model(self):
+        """Get the Sentence-BERT model, loading it once even under concurrent callers."""
+        if self.model is None:
+            with self._model_lock:
+                if self.model is None:
+                    self._load_model()
+        return self.model
+    
+    @staticmethod
+    def extract_text_from_pdf(file_path: str) -> str:
         """Extract text from PDF file."""
         try:
-            text = ""
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+                text = "\n".join(page.extract_text() or "" for page in pdf_reader.pages)
             return text.strip()
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             raise
     
-    def extract_text_from_docx(self, file_path: str) -> str:
+    @staticmethod
+    def extract_text_from_docx(file_path: str) -> str:
         """Extract text from DOCX file."""
         try:
             doc = docx.Document(file_path)
@@ -59,14 +73,15 @@ class ResumeParser:
             logger.error(f"Error extracting text from DOCX: {e}")
             raise
     
-    def extract_text(self, file_path: str) -> str:
+    @staticmethod
+    def extract_text(file_path: str) -> str:
         """Extract text from resume file (PDF or DOCX)."""
         file_extension = Path(file_path).suffix.lower()
         
         if file_extension == '.pdf':
-            return self.extract_text_from_pdf(file_path)
+            return ResumeParser.extract_text_from_pdf(file_path)
         elif file_extension in ['.docx', '.doc']:
-            return self.extract_text_from_docx(file_path)
+            return ResumeParser.extract_text_from_docx(file_path)
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
@@ -206,19 +221,16 @@ class ResumeParser:
         
         return education
     
-    def generate_embeddings(self, text: str) -> List[float]:
+    def generate_embeddings(self, text: str) -> Optional[np.ndarray]:
         """Generate semantic embeddings for resume text using Sentence-BERT."""
         try:
-            if self.model is None:
-                self._load_model()
-            
             # Generate embeddings
-            embeddings = self.model.encode(text, convert_to_numpy=True)
-            return embeddings.tolist()
+            embeddings = self.get_model().encode(text, convert_to_numpy=True)
+            return embeddings.astype(np.float32, copy=False)
         
         except Exception as e:
             logger.error(f"Error generating embeddings: {e}")
-            return []
+            return None
     
     async def parse_resume(self, file_path: str) -> ResumeData:
         """
@@ -231,8 +243,8 @@ class ResumeParser:
             ResumeData object with parsed information
         """
         try:
-            # Extract text
-            raw_text = self.extract_text(file_path)
+            # Extract text in the process pool (static method, so nothing heavy is pickled)
+            raw_text = await run_parse_bound(ResumeParser.extract_text, file_path)
             
             # Extract components
             skills = self.extract_skills(raw_text)
@@ -241,8 +253,11 @@ class ResumeParser:
             projects = self.extract_projects(raw_text)
             education = self.extract_education(raw_text)
             
-            # Generate embeddings
-            embeddings = self.generate_embeddings(raw_text)
+            # Generate embeddings, stored int8-quantized
+            embeddings = await run_in_threadpool(self.generate_embeddings, raw_text)
+            embeddings_scale = None
+            if embeddings is not None:
+                embeddings, embeddings_scale = quantize_int8(embeddings)
             
             resume_data = ResumeData(
                 raw_text=raw_text,
@@ -252,7 +267,8 @@ class ResumeParser:
                 projects=projects,
                 education=education,
                 certifications=[],  # TODO: Extract certifications
-                embeddings=embeddings
+                embeddings=embeddings,
+                embeddings_scale=embeddings_scale
             )
             
             logger.info(f"Successfully parsed resume: {len(skills)} skills, {len(experience)} experiences")
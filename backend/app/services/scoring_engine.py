@@ -4,8 +4,7 @@ Calculates readiness scores and generates plain-English explanations using GPT-3
 """
 
 import logging
-from typing import List, Dict, Optional
-from openai import AsyncOpenAI
+from typing import Dict, Iterable, List, Optional
 
 from app.config import settings
 from app.models.scoring import ReadinessScore, FactorContribution
@@ -21,12 +20,13 @@ class ScoringEngine:
         """Initialize scoring engine with OpenAI client."""
         self.client = None
         if settings.openai_api_key:
+            from openai import AsyncOpenAI
             self.client = AsyncOpenAI(api_key=settings.openai_api_key)
     
     def calculate_technical_skills_score(
         self,
-        user_skills: List[str],
-        required_skills: List[str]
+        user_skills: Iterable[str],
+        required_skills: Iterable[str]
     ) -> tuple[float, str]:
         """
         Calculate technical skills match score.
@@ -37,7 +37,8 @@ class ScoringEngine:
         if not required_skills:
             return 100.0, "No specific skills required"
         
-        matched_skills = set(user_skills) & set(required_skills)
+        # frozenset() of a frozenset is a no-op, so precomputed sets pass straight through
+        matched_skills = frozenset(user_skills) & frozenset(required_skills)
         match_percentage = (len(matched_skills) / len(required_skills)) * 100
         
         details = f"Matched {len(matched_skills)}/{len(required_skills)} required skills"
@@ -98,8 +99,8 @@ class ScoringEngine:
     
     def calculate_tool_proficiency_score(
         self,
-        user_tools: List[str],
-        required_tools: List[str]
+        user_tools: Iterable[str],
+        required_tools: Iterable[str]
     ) -> tuple[float, str]:
         """
         Calculate tool proficiency score.
@@ -110,7 +111,7 @@ class ScoringEngine:
         if not required_tools:
             return 100.0, "No specific tools required"
         
-        matched_tools = set(user_tools) & set(required_tools)
+        matched_tools = frozenset(user_tools) & frozenset(required_tools)
         match_percentage = (len(matched_tools) / len(required_tools)) * 100
         
         details = f"Proficient in {len(matched_tools)}/{len(required_tools)} required tools"
@@ -121,8 +122,8 @@ class ScoringEngine:
         self,
         resume_data: ResumeData,
         target_role: str,
-        required_skills: List[str],
-        required_tools: Optional[List[str]] = None
+        required_skills: Iterable[str],
+        required_tools: Optional[Iterable[str]] = None
     ) -> ReadinessScore:
         """
         Calculate overall career readiness score with factor breakdown.
@@ -130,13 +131,16 @@ class ScoringEngine:
         Args:
             resume_data: Parsed resume data
             target_role: Target role title
-            required_skills: List of required skills for the role
-            required_tools: Optional list of required tools
+            required_skills: Required skills for the role (ideally a frozenset)
+            required_tools: Optional required tools (ideally a frozenset)
             
         Returns:
             ReadinessScore with detailed breakdown
         """
-        required_tools = required_tools or []
+        # Hash both sides once; every factor below reuses these sets
+        required_skills = frozenset(required_skills)
+        required_tools = frozenset(required_tools or ())
+        user_skills = frozenset(resume_data.skills)
         
         # Define scoring weights
         weights = {
@@ -148,7 +152,7 @@ class ScoringEngine:
         
         # Calculate individual factor scores
         tech_score, tech_details = self.calculate_technical_skills_score(
-            resume_data.skills,
+            user_skills,
             required_skills
         )
         
@@ -165,30 +169,30 @@ class ScoringEngine:
             required_tools
         )
         
-        # Create factor contributions
+        # Create factor contributions (internal values, so skip validation)
         factors = [
-            FactorContribution(
+            FactorContribution.model_construct(
                 factor_name="Technical Skills",
                 weight=weights["technical_skills"],
                 score=tech_score,
                 contribution=tech_score * weights["technical_skills"],
                 details=tech_details
             ),
-            FactorContribution(
+            FactorContribution.model_construct(
                 factor_name="Experience",
                 weight=weights["experience"],
                 score=exp_score,
                 contribution=exp_score * weights["experience"],
                 details=exp_details
             ),
-            FactorContribution(
+            FactorContribution.model_construct(
                 factor_name="Project Portfolio",
                 weight=weights["projects"],
                 score=proj_score,
                 contribution=proj_score * weights["projects"],
                 details=proj_details
             ),
-            FactorContribution(
+            FactorContribution.model_construct(
                 factor_name="Tool Proficiency",
                 weight=weights["tools"],
                 score=tool_score,
@@ -213,7 +217,7 @@ class ScoringEngine:
         )
         
         # Generate recommendations
-        recommendations = self.generate_recommendations(factors, required_skills, resume_data.skills)
+        recommendations = self.generate_recommendations(factors, required_skills, user_skills)
         
         return ReadinessScore(
             overall_score=round(overall_score, 2),
@@ -321,8 +325,8 @@ Focus on what's strong and what needs improvement. Be specific and actionable.
     def generate_recommendations(
         self,
         factors: List[FactorContribution],
-        required_skills: List[str],
-        user_skills: List[str]
+        required_skills: Iterable[str],
+        user_skills: Iterable[str]
     ) -> List[str]:
         """Generate actionable recommendations."""
         recommendations = []
@@ -331,7 +335,7 @@ Focus on what's strong and what needs improvement. Be specific and actionable.
         for factor in factors:
             if factor.score < 50:
                 if factor.factor_name == "Technical Skills":
-                    missing = set(required_skills) - set(user_skills)
+                    missing = frozenset(required_skills) - frozenset(user_skills)
                     if missing:
                         recommendations.append(
                             f"Learn key skills: {', '.join(list(missing)[:3])}"
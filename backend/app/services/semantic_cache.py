@@ -0,0 +1,137 @@
+"""
+Semantic Cache Service
+Reuses LLM answers for prompts that mean the same thing as a recent one.
+Prompts are embedded with the resume parser's Sentence-BERT model and
+matched by cosine similarity within a scope (user, target role and the
+conversation so far).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _ScopeEntries:
+    """Unit-length prompt embeddings and their answers for one scope, oldest first."""
+
+    def __init__(self, dimension: int):
+        self.vectors = np.empty((0, dimension), dtype=np.float32)
+        self.responses: List[str] = []
+        self.expires_at: List[float] = []
+
+
+class SemanticResponseCache:
+    """
+    In-process semantic cache for chat responses.
+
+    A prompt is embedded once with embed(); the same embedding is used to
+    match() and, on a miss, to store() the LLM's answer.
+    """
+
+    MAX_SCOPES = 1024
+    MAX_ENTRIES_PER_SCOPE = 256
+
+    def __init__(self, threshold: float = 0.92, ttl: int = 86400):
+        """Initialize the cache. The embedding model loads on first use."""
+        self.threshold = threshold
+        self.ttl = ttl
+        self.model = None
+        self._disabled = False
+        self._scopes: "OrderedDict[Hashable, _ScopeEntries]" = OrderedDict()
+
+    def _load_model(self):
+        """Share the resume parser's Sentence-BERT model rather than loading a second copy."""
+        # Imported here so importing the app doesn't pull in the parsers
+        from app.services.resume_parser import resume_parser
+
+        self.model = resume_parser.get_model()
+        logger.info(f"Semantic cache using {settings.sentence_bert_model}")
+
+    def _encode(self, text: str) -> Optional[np.ndarray]:
+        """Embed a prompt as a unit-length float32 vector, or None if unavailable."""
+        if self._disabled:
+            return None
+        if self.model is None:
+            try:
+                self._load_model()
+            except Exception as e:
+                # No model: chat keeps working, just without the cache
+                logger.warning(f"Semantic cache disabled: {e}")
+                self._disabled = True
+                return None
+        try:
+            return self.model.encode([text], convert_to_numpy=True, normalize_embeddings=True)[0].astype(np.float32)
+        except Exception as e:
+            # A failed encode (bad input, transient OOM) skips the cache for this prompt only
+            logger.warning(f"Semantic cache skipped for one prompt: {e}")
+            return None
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a prompt off the event loop; None if the model is unavailable."""
+        return await asyncio.to_thread(self._encode, text)
+
+    def match(self, scope: Hashable, embedding: Optional[np.ndarray]) -> Optional[str]:
+        """Return a live cached response for a similar prompt in this scope, or None."""
+        if embedding is None:
+            return None
+
+        entries = self._scopes.get(scope)
+        if entries is None or not entries.responses:
+            return None
+        self._scopes.move_to_end(scope)
+
+        # Unit vectors: cosine similarity is a dot product
+        similarities = entries.vectors @ embedding
+        now = time.monotonic()
+        for idx in np.argsort(similarities)[::-1]:
+            if similarities[idx] < self.threshold:
+                break
+            if entries.expires_at[idx] > now:
+                return entries.responses[idx]
+        return None
+
+    def store(self, scope: Hashable, embedding: Optional[np.ndarray], response: str):
+        """Remember a response for the prompt embedding returned by embed()."""
+        if embedding is None:
+            return
+
+        entries = self._scopes.get(scope)
+        if entries is None:
+            if len(self._scopes) >= self.MAX_SCOPES:
+                self._scopes.popitem(last=False)
+            entries = self._scopes[scope] = _ScopeEntries(embedding.shape[0])
+        self._scopes.move_to_end(scope)
+
+        # Drop expired entries and, past the cap, the oldest ones
+        now = time.monotonic()
+        keep = [i for i, expires_at in enumerate(entries.expires_at) if expires_at > now]
+        keep = keep[-(self.MAX_ENTRIES_PER_SCOPE - 1):]
+        entries.vectors = np.vstack([entries.vectors[keep], embedding[np.newaxis, :]])
+        entries.responses = [entries.responses[i] for i in keep] + [response]
+        entries.expires_at = [entries.expires_at[i] for i in keep] + [now + self.ttl]
+
+
+# Singleton instance
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+def get_semantic_cache() -> SemanticResponseCache:
+    """Get singleton instance of the semantic cache."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticResponseCache(
+                    threshold=settings.chat_cache_similarity,
+                    ttl=settings.chat_cache_ttl
+                )
+    return _semantic_cache
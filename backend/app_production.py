@@ -10,6 +10,7 @@ from typing import List, Optional
 from pydantic import BaseModel
 import uvicorn
 from datetime import datetime
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -99,10 +100,21 @@ async def lifespan(app: FastAPI):
     # Initialize services
     logger.info("🤖 Initializing AI services...")
     try:
-        # Warm up models (optional - can be slow on first run)
-        # parser = get_parser()
-        # logger.info("✅ Resume parser ready")
-        pass
+        # Build request-path singletons once, before traffic arrives
+        get_auth_service()
+        if AI_AGENT_AVAILABLE:
+            try:
+                get_agent()
+                logger.info("✅ AI agent ready")
+            except Exception as e:
+                # Needs MongoDB; retried lazily on the first chat request
+                logger.warning(f"⚠️ AI agent not initialized: {e}")
+        
+        # Load and warm the models now so the first upload doesn't pay for it
+        if RESUME_PARSER_AVAILABLE:
+            parser = await asyncio.to_thread(get_parser)
+            await asyncio.to_thread(parser.warmup)
+            logger.info("✅ Resume parser ready")
     except Exception as e:
         logger.warning(f"⚠️ Service initialization warning: {e}")
     
@@ -114,6 +126,9 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 Shutting down SkillLens...")
     await MongoDB.disconnect()
     await Neo4jClient.disconnect()
+    
+    from app.services.cpu_pool import shutdown_cpu_pool
+    shutdown_cpu_pool()
     logger.info("👋 Shutdown complete")
 
 
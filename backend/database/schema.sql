@@ -22,9 +22,10 @@ CREATE TABLE users (
 CREATE TABLE resumes (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    filename VARCHAR(255) NOT NULL,
-    file_path VARCHAR(500) NOT NULL,
+    filename TEXT NOT NULL,
+    file_path TEXT NOT NULL,
     parsed_data JSONB,  -- Stores parsed resume data as JSON
+    content_sha256 CHAR(64),  -- SHA-256 of the uploaded file, for dedup
     uploaded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -34,16 +35,16 @@ CREATE TABLE readiness_scores (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     resume_id UUID REFERENCES resumes(id) ON DELETE SET NULL,
-    target_role VARCHAR(255) NOT NULL,
-    overall_score NUMERIC(5,2) NOT NULL,
-    technical_skills_score NUMERIC(5,2),
-    experience_score NUMERIC(5,2),
-    project_score NUMERIC(5,2),
-    tool_score NUMERIC(5,2),
+    target_role TEXT NOT NULL,
+    overall_score DOUBLE PRECISION NOT NULL,
+    technical_skills_score DOUBLE PRECISION,
+    experience_score DOUBLE PRECISION,
+    project_score DOUBLE PRECISION,
+    tool_score DOUBLE PRECISION,
     explanation TEXT,
-    strengths JSONB,  -- Array of strings
-    weaknesses JSONB,  -- Array of strings
-    recommendations JSONB,  -- Array of strings
+    strengths TEXT[],
+    weaknesses TEXT[],
+    recommendations TEXT[],
     factors JSONB,  -- Detailed factor breakdown
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -54,7 +55,7 @@ CREATE TABLE assessments (
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     skill VARCHAR(100) NOT NULL,
     difficulty VARCHAR(50) NOT NULL,
-    questions JSONB NOT NULL,  -- Array of question objects
+    questions BYTEA NOT NULL,  -- orjson-encoded array of question objects
     total_points INTEGER NOT NULL,
     time_limit_minutes INTEGER NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
@@ -65,10 +66,10 @@ CREATE TABLE assessment_results (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     assessment_id UUID NOT NULL REFERENCES assessments(id) ON DELETE CASCADE,
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    answers JSONB NOT NULL,  -- Array of answer objects
+    answers BYTEA NOT NULL,  -- orjson-encoded array of answer objects
     score INTEGER NOT NULL,
     max_score INTEGER NOT NULL,
-    percentage NUMERIC(5,2) NOT NULL,
+    percentage DOUBLE PRECISION NOT NULL,
     confidence_level VARCHAR(50) NOT NULL,
     passed BOOLEAN NOT NULL,
     feedback JSONB,  -- Array of feedback strings
@@ -79,10 +80,10 @@ CREATE TABLE assessment_results (
 CREATE TABLE learning_plans (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    target_role VARCHAR(255) NOT NULL,
+    target_role TEXT NOT NULL,
     current_skills JSONB NOT NULL,  -- Array of skills
     target_skills JSONB NOT NULL,  -- Array of skills
-    learning_path JSONB NOT NULL,  -- Array of learning step objects
+    learning_path BYTEA NOT NULL,  -- orjson-encoded array of learning step objects
     estimated_weeks INTEGER,
     status VARCHAR(50) DEFAULT 'active',
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -104,11 +105,13 @@ CREATE TABLE learning_progress (
 );
 
 -- Job listings table (cached from external APIs)
+-- Partitioned by fetched_at month; monthly partitions are created by
+-- PostgreSQL.ensure_partitions() in the backend
 CREATE TABLE job_listings (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    title VARCHAR(255) NOT NULL,
-    company VARCHAR(255) NOT NULL,
-    location VARCHAR(255),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT,
     description TEXT,
     required_skills JSONB,  -- Array of skills
     salary_range VARCHAR(100),
@@ -117,8 +120,11 @@ CREATE TABLE job_listings (
     source VARCHAR(100),  -- 'serpapi', 'linkedin', etc.
     external_url TEXT,
     posted_date DATE,
-    fetched_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    fetched_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, fetched_at)
+) PARTITION BY RANGE (fetched_at);
+
+CREATE TABLE job_listings_default PARTITION OF job_listings DEFAULT;
 
 -- Predictions table (shortlisting probability)
 CREATE TABLE predictions (
@@ -126,23 +132,28 @@ CREATE TABLE predictions (
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     resume_id UUID REFERENCES resumes(id) ON DELETE SET NULL,
     job_description TEXT NOT NULL,
-    shortlist_probability NUMERIC(5,2) NOT NULL,
+    shortlist_probability DOUBLE PRECISION NOT NULL,
     confidence VARCHAR(50) NOT NULL,
-    factors JSONB NOT NULL,  -- Contributing factors
+    factors BYTEA NOT NULL,  -- orjson-encoded contributing factors
     recommendations JSONB,  -- Improvement suggestions
     predicted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Conversation history table (for AI agent)
+-- Partitioned by created_at month; monthly partitions are created by
+-- PostgreSQL.ensure_partitions() in the backend
 CREATE TABLE conversations (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     session_id UUID NOT NULL,
     role VARCHAR(50) NOT NULL,  -- 'user' or 'assistant'
     content TEXT NOT NULL,
     metadata JSONB,  -- Additional context
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE conversations_default PARTITION OF conversations DEFAULT;
 
 -- Skills table (optional, if not using Neo4j)
 CREATE TABLE skills (
@@ -163,11 +174,12 @@ CREATE TABLE skill_prerequisites (
 );
 
 -- Indexes for performance
-CREATE INDEX idx_resumes_user_id ON resumes(user_id);
+CREATE INDEX idx_resumes_user_uploaded ON resumes(user_id, uploaded_at DESC);
 CREATE INDEX idx_resumes_uploaded_at ON resumes(uploaded_at DESC);
+CREATE UNIQUE INDEX idx_resumes_user_sha256 ON resumes(user_id, content_sha256);
 
-CREATE INDEX idx_readiness_scores_user_id ON readiness_scores(user_id);
-CREATE INDEX idx_readiness_scores_created_at ON readiness_scores(created_at DESC);
+CREATE INDEX idx_readiness_user_created ON readiness_scores(user_id, created_at DESC);
+CREATE INDEX idx_readiness_weak_gin ON readiness_scores USING gin(weaknesses);
 
 CREATE INDEX idx_assessments_user_id ON assessments(user_id);
 CREATE INDEX idx_assessments_skill ON assessments(skill);
@@ -183,12 +195,13 @@ CREATE INDEX idx_learning_progress_plan_id ON learning_progress(learning_plan_id
 
 CREATE INDEX idx_job_listings_posted_date ON job_listings(posted_date DESC);
 CREATE INDEX idx_job_listings_location ON job_listings(location);
+CREATE INDEX idx_job_listings_fetched_brin ON job_listings USING brin(fetched_at);
 
-CREATE INDEX idx_predictions_user_id ON predictions(user_id);
-CREATE INDEX idx_predictions_predicted_at ON predictions(predicted_at DESC);
+CREATE INDEX idx_predictions_user_predicted ON predictions(user_id, predicted_at DESC);
 
-CREATE INDEX idx_conversations_user_id ON conversations(user_id);
-CREATE INDEX idx_conversations_session_id ON conversations(session_id);
+CREATE INDEX idx_conversations_user_created ON conversations(user_id, created_at DESC);
+CREATE INDEX idx_conversations_session_created ON conversations(session_id, created_at);
+CREATE INDEX idx_conversations_created_brin ON conversations USING brin(created_at);
 
 CREATE INDEX idx_skills_category ON skills(category);
 CREATE INDEX idx_skills_name ON skills(name);
@@ -0,0 +1,47 @@
+"""store opaque json payloads as orjson-encoded bytea
+
+Revision ID: 3efa44df8b62
+Revises:
+Create Date: 2026-10-16 03:05:41.000000
+
+First revision: applies to databases created from the original schema.sql
+or Base.metadata.create_all(). Databases created from the current models
+already have this layout; run ``alembic stamp head`` on those instead.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3efa44df8b62'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs mapped to CompactJSON
+COLUMNS = [
+    ("assessments", "questions"),
+    ("assessment_results", "answers"),
+    ("learning_plans", "learning_path"),
+    ("predictions", "factors"),
+]
+
+
+def upgrade() -> None:
+    # CompactJSON.process_result_value parses the jsonb text form as-is
+    for table, column in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BYTEA "
+            f"USING convert_to({column}::text, 'UTF8')"
+        )
+
+
+def downgrade() -> None:
+    for table, column in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB "
+            f"USING convert_from({column}, 'UTF8')::jsonb"
+        )
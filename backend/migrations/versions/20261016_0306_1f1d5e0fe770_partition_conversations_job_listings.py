@@ -0,0 +1,108 @@
+"""range-partition conversations and job_listings by month
+
+Revision ID: 1f1d5e0fe770
+Revises: 3efa44df8b62
+Create Date: 2026-10-16 03:06:58.000000
+
+Postgres can't convert a table to a partitioned one in place, so each table
+is rebuilt: the old table is renamed, a partitioned copy is created with
+monthly partitions covering the existing rows through three months ahead
+(plus DEFAULT), and the rows are copied over. Both tables are locked while
+this runs. PostgreSQL.ensure_partitions() keeps later months created.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f1d5e0fe770'
+down_revision: Union[str, None] = '3efa44df8b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> partition key, constraints besides the primary key, indexes
+TABLES = {
+    "conversations": {
+        "key": "created_at",
+        "constraints": ["FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE"],
+        "indexes": [
+            "CREATE INDEX idx_conversations_user_created ON conversations (user_id, created_at DESC)",
+            "CREATE INDEX idx_conversations_session_created ON conversations (session_id, created_at)",
+        ],
+        "brin": "CREATE INDEX idx_conversations_created_brin ON conversations USING brin (created_at)",
+    },
+    "job_listings": {
+        "key": "fetched_at",
+        "constraints": [],
+        "indexes": [
+            "CREATE INDEX idx_job_listings_posted_date ON job_listings (posted_date)",
+            "CREATE INDEX idx_job_listings_location ON job_listings (location)",
+        ],
+        "brin": "CREATE INDEX idx_job_listings_fetched_brin ON job_listings USING brin (fetched_at)",
+    },
+}
+
+
+def _rebuild(table: str, suffix: str, constraints: list) -> None:
+    """Rename ``table`` to ``<table>_old`` and create an empty copy of its columns."""
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey")
+    op.execute(
+        f"CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS) {suffix}"
+    )
+    for constraint in constraints:
+        op.execute(f"ALTER TABLE {table} ADD {constraint}")
+
+
+def _copy_and_drop_old(table: str, indexes: list) -> None:
+    """Move rows from ``<table>_old``, drop it, then build indexes on the loaded table."""
+    op.execute(f"INSERT INTO {table} SELECT * FROM {table}_old")
+    op.execute(f"DROP TABLE {table}_old")
+    for index in indexes:
+        op.execute(index)
+
+
+def upgrade() -> None:
+    for table, spec in TABLES.items():
+        key = spec["key"]
+        op.execute(f"UPDATE {table} SET {key} = CURRENT_TIMESTAMP WHERE {key} IS NULL")
+        _rebuild(
+            table,
+            f"PARTITION BY RANGE ({key})",
+            [f"PRIMARY KEY (id, {key})", *spec["constraints"]],
+        )
+
+        # Months from the oldest row through three ahead, named like
+        # PostgreSQL.ensure_partitions() names them
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month date;
+            BEGIN
+                FOR month IN
+                    SELECT generate_series(
+                        date_trunc('month', COALESCE((SELECT min({key}) FROM {table}_old), now())),
+                        date_trunc('month', now()) + interval '3 months',
+                        interval '1 month'
+                    )::date
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_' || to_char(month, 'YYYYMM'), month, (month + interval '1 month')::date
+                    );
+                END LOOP;
+            END $$
+        """)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        _copy_and_drop_old(table, [*spec["indexes"], spec["brin"]])
+
+
+def downgrade() -> None:
+    for table, spec in TABLES.items():
+        _rebuild(table, "", ["PRIMARY KEY (id)", *spec["constraints"]])
+        # Dropping the partitioned table drops its partitions
+        _copy_and_drop_old(table, spec["indexes"])
@@ -0,0 +1,48 @@
+"""store score columns as double precision
+
+Revision ID: fa58cbe528a3
+Revises: 1f1d5e0fe770
+Create Date: 2026-10-16 03:07:46.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa58cbe528a3'
+down_revision: Union[str, None] = '1f1d5e0fe770'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> columns that were NUMERIC(5, 2)
+COLUMNS = {
+    "readiness_scores": [
+        "overall_score",
+        "technical_skills_score",
+        "experience_score",
+        "project_score",
+        "tool_score",
+    ],
+    "assessment_results": ["percentage"],
+    "predictions": ["shortlist_probability"],
+}
+
+
+def _alter(column_type: str) -> None:
+    """Change every listed column to ``column_type``, one table rewrite per table."""
+    for table, columns in COLUMNS.items():
+        op.execute(
+            f"ALTER TABLE {table} "
+            + ", ".join(f"ALTER COLUMN {column} TYPE {column_type}" for column in columns)
+        )
+
+
+def upgrade() -> None:
+    _alter("DOUBLE PRECISION")
+
+
+def downgrade() -> None:
+    _alter("NUMERIC(5, 2)")
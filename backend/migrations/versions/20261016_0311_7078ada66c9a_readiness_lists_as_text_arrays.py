@@ -0,0 +1,52 @@
+"""store readiness strengths/weaknesses/recommendations as text[]
+
+Revision ID: 7078ada66c9a
+Revises: fa58cbe528a3
+Create Date: 2026-10-16 03:11:22.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7078ada66c9a'
+down_revision: Union[str, None] = 'fa58cbe528a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ["strengths", "weaknesses", "recommendations"]
+
+
+def upgrade() -> None:
+    # ALTER ... USING can't contain a subquery, so unpacking the JSON array
+    # goes through a temporary helper. Arrays keep their elements in order,
+    # a bare string becomes a one-element array, anything else becomes NULL.
+    op.execute("""
+        CREATE FUNCTION pg_temp.jsonb_to_text_array(value jsonb) RETURNS text[]
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT CASE jsonb_typeof(value)
+                WHEN 'array' THEN ARRAY(SELECT jsonb_array_elements_text(value))
+                WHEN 'string' THEN ARRAY[value #>> '{}']
+            END
+        $$
+    """)
+    op.execute(
+        "ALTER TABLE readiness_scores "
+        + ", ".join(
+            f"ALTER COLUMN {column} TYPE TEXT[] USING pg_temp.jsonb_to_text_array({column})"
+            for column in COLUMNS
+        )
+    )
+    op.execute("DROP FUNCTION pg_temp.jsonb_to_text_array(jsonb)")
+    op.execute("CREATE INDEX idx_readiness_weak_gin ON readiness_scores USING gin (weaknesses)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_readiness_weak_gin")
+    op.execute(
+        "ALTER TABLE readiness_scores "
+        + ", ".join(f"ALTER COLUMN {column} TYPE JSONB USING to_jsonb({column})" for column in COLUMNS)
+    )
@@ -46,6 +46,7 @@ async def startup():
     
     print("Loading Advanced Resume Parser...")
     resume_parser = get_parser()
+    resume_parser.warmup()
     print("Resume parser ready!")
     
     print("Initializing Skill Knowledge Graph...")
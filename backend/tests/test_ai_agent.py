@@ -0,0 +1,225 @@
+"""
+Tests for the career agent's chat turn and its semantic response cache.
+"""
+
+import asyncio
+import importlib
+import sys
+import types
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from app.database import MongoDB
+from app.models.agent_models import ChatRequest
+from app.services import semantic_cache
+from app.services.resume_parser import resume_parser
+
+
+class FakeLLM:
+    """Chat model double that numbers its answers and records the prompts."""
+
+    def __init__(self, **kwargs):
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        return types.SimpleNamespace(content=f"answer {len(self.calls)}")
+
+
+def _message_class(name):
+    return type(name, (), {"__init__": lambda self, content: setattr(self, "content", content)})
+
+
+def langchain_stubs():
+    """Just enough of langchain for ai_agent to import without it installed."""
+    names = [
+        "langchain_openai", "langchain", "langchain.agents", "langchain.prompts",
+        "langchain.memory", "langchain.tools", "langchain_core", "langchain_core.messages"
+    ]
+    stubs = {name: types.ModuleType(name) for name in names}
+    stubs["langchain_openai"].ChatOpenAI = FakeLLM
+    stubs["langchain.agents"].AgentExecutor = None
+    stubs["langchain.agents"].create_openai_functions_agent = None
+    stubs["langchain.prompts"].ChatPromptTemplate = None
+    stubs["langchain.prompts"].MessagesPlaceholder = None
+    stubs["langchain.memory"].ConversationBufferMemory = None
+    stubs["langchain.tools"].Tool = None
+    for name in ("HumanMessage", "AIMessage", "SystemMessage"):
+        setattr(stubs["langchain_core.messages"], name, _message_class(name))
+    return stubs
+
+
+class FakeConversations:
+    """Motor collection double holding conversations by user_id."""
+
+    def __init__(self):
+        self.docs = {}
+        self.error = None
+
+    def _append(self, user_id, update):
+        messages = self.docs.setdefault(user_id, {"messages": []})["messages"]
+        messages.extend(update["$push"]["messages"]["$each"])
+
+    async def find_one_and_update(self, query, update, projection, upsert, return_document):
+        if self.error is not None:
+            raise self.error
+        doc = self.docs.get(query["user_id"])
+        before = None
+        if doc is not None:
+            before = {"messages": doc["messages"][projection["messages"]["$slice"]:]}
+        self._append(query["user_id"], update)
+        return before
+
+    async def update_one(self, query, update, upsert):
+        self._append(query["user_id"], update)
+
+    async def delete_one(self, query):
+        deleted = self.docs.pop(query["user_id"], None) is not None
+        return types.SimpleNamespace(deleted_count=int(deleted))
+
+
+class FakeEncoder:
+    """Sentence-BERT double: questions about skills point one way, the rest another."""
+
+    def __init__(self):
+        self.texts = []
+
+    def encode(self, texts, convert_to_numpy=True, normalize_embeddings=True):
+        self.texts.extend(texts)
+        return np.array([[1.0, 0.0] if "skill" in t.lower() else [0.0, 1.0] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    fake = FakeEncoder()
+    monkeypatch.setattr(resume_parser, "model", fake)
+    monkeypatch.setattr(semantic_cache, "_semantic_cache", None)
+    return fake
+
+
+@pytest.fixture
+def agent(monkeypatch, encoder):
+    conversations = FakeConversations()
+    monkeypatch.setattr(MongoDB, "db", types.SimpleNamespace(conversations=conversations))
+    # ai_agent is imported against the stubs and dropped again afterwards
+    with mock.patch.dict(sys.modules, langchain_stubs()):
+        sys.modules.pop("app.services.ai_agent", None)
+        ai_agent = importlib.import_module("app.services.ai_agent")
+        yield ai_agent.AdaptiveCareerAgent()
+
+
+def chat(agent, user_id="u1", message="What skills do I need?", target_role="Data Engineer"):
+    """Run one chat turn and wait for its background save."""
+    async def turn():
+        response = await agent.chat(
+            ChatRequest(user_id=user_id, message=message, context={"target_role": target_role})
+        )
+        await asyncio.gather(*agent._pending_writes)
+        return response
+
+    return asyncio.run(turn())
+
+
+class TestChatTurn:
+    """One request through history, the semantic cache and the LLM."""
+
+    def test_turn_sends_history_and_saves_both_messages(self, agent):
+        chat(agent, message="Hello")
+        response = chat(agent, message="What skills do I need?")
+
+        assert response.message == "answer 2"
+        assert response.metadata["cached"] is False
+        prompt = [m.content for m in agent.llm.calls[-1][1:]]
+        assert prompt == ["Hello", "answer 1", "What skills do I need?"]
+        stored = agent.db.conversations.docs["u1"]["messages"]
+        assert [m["role"] for m in stored] == ["user", "assistant", "user", "assistant"]
+
+    def test_cache_shares_the_resume_parser_encoder(self, agent, encoder):
+        chat(agent)
+
+        assert agent.response_cache is semantic_cache.get_semantic_cache()
+        assert agent.response_cache.model is encoder
+        assert encoder.texts == ["What skills do I need?"]
+
+
+class TestSemanticCacheScope:
+    """Cached answers are only reused for the same point in a conversation."""
+
+    def test_similar_question_in_fresh_conversation_hits_cache(self, agent):
+        first = chat(agent, message="What skills do I need?")
+        asyncio.run(agent.clear_conversation("u1"))
+        second = chat(agent, message="Which skills should I learn?")
+
+        assert second.message == first.message
+        assert second.metadata["cached"] is True
+        assert len(agent.llm.calls) == 1
+
+    def test_prior_turns_change_the_scope(self, agent):
+        chat(agent, message="What skills do I need?")
+        repeat = chat(agent, message="What skills do I need?")
+
+        # The earlier answer was given without this conversation's history
+        assert repeat.metadata["cached"] is False
+        assert len(agent.llm.calls) == 2
+
+    def test_scope_is_per_user_and_role(self, agent):
+        chat(agent, user_id="u1", target_role="Data Engineer")
+        chat(agent, user_id="u2", target_role="Data Engineer")
+        asyncio.run(agent.clear_conversation("u1"))
+        other_role = chat(agent, user_id="u1", target_role="Web Developer")
+
+        assert other_role.metadata["cached"] is False
+        assert len(agent.llm.calls) == 3
+
+    def test_unknown_history_bypasses_cache(self, agent):
+        opening = chat(agent, message="What skills do I need?")
+        chat(agent, message="Tell me more")
+
+        # Mid-conversation, the history read fails: the turn must not be
+        # mistaken for a fresh conversation and served the opening answer
+        agent.db.conversations.error = RuntimeError("mongo down")
+        during_outage = chat(agent, message="What skills do I need?")
+        assert during_outage.metadata["cached"] is False
+        assert during_outage.message != opening.message
+
+        # ...nor is its answer remembered for fresh conversations
+        agent.db.conversations.error = None
+        asyncio.run(agent.clear_conversation("u1"))
+        fresh = chat(agent, message="Which skills should I learn?")
+        assert fresh.metadata["cached"] is True
+        assert fresh.message == opening.message
+        assert len(agent.llm.calls) == 3
+
+
+class TestEncoderFailures:
+    """Only a missing model turns the cache off for good."""
+
+    def test_encode_error_skips_only_that_prompt(self, encoder, monkeypatch):
+        cache = semantic_cache.SemanticResponseCache()
+        real_encode = encoder.encode
+
+        def flaky_encode(texts, **kwargs):
+            if texts == ["boom"]:
+                raise RuntimeError("CUDA out of memory")
+            return real_encode(texts, **kwargs)
+
+        monkeypatch.setattr(encoder, "encode", flaky_encode)
+
+        assert asyncio.run(cache.embed("boom")) is None
+        assert asyncio.run(cache.embed("What skills do I need?")) is not None
+
+    def test_model_load_failure_disables_cache(self, monkeypatch):
+        cache = semantic_cache.SemanticResponseCache()
+        loads = []
+
+        def failing_load():
+            loads.append(1)
+            raise OSError("model not downloaded")
+
+        monkeypatch.setattr(cache, "_load_model", failing_load)
+
+        assert asyncio.run(cache.embed("What skills do I need?")) is None
+        assert asyncio.run(cache.embed("What skills do I need?")) is None
+        assert loads == [1]
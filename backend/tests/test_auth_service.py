@@ -0,0 +1,241 @@
+"""
+Tests for AuthService caching: user rows, verified tokens and logins.
+"""
+
+import asyncio
+import time
+import types
+import uuid
+from datetime import datetime, timezone
+
+import bcrypt
+import pytest
+from sqlalchemy.sql.dml import Update
+
+from app.services import auth_service
+from app.services.auth_service import AuthService, UserLogin
+
+
+class FakeClock:
+    """Stands in for the time module inside the auth service."""
+
+    def __init__(self):
+        self.offset = 0.0
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self.offset
+
+    def time(self) -> float:
+        return time.time()
+
+
+class FakeDB:
+    """Async session double serving a single users row."""
+
+    def __init__(self, row, delay: float = 0.0, error: Exception = None):
+        self.row = row
+        self.delay = delay
+        self.error = error
+        self.selects = 0
+
+    async def execute(self, statement):
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        if isinstance(statement, Update):
+            for column, value in statement.compile().params.items():
+                if hasattr(self.row, column):
+                    setattr(self.row, column, value)
+            return types.SimpleNamespace(rowcount=1)
+        self.selects += 1
+        return types.SimpleNamespace(scalar_one_or_none=lambda: self.row)
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(auth_service, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def row():
+    return types.SimpleNamespace(
+        id=uuid.uuid4(),
+        email="student@example.com",
+        full_name="Test Student",
+        role="student",
+        department=None,
+        register_number=None,
+        created_at=datetime.now(timezone.utc),
+        is_active=True,
+        hashed_password="",
+    )
+
+
+@pytest.fixture
+def service():
+    return AuthService()
+
+
+class TestUserCache:
+    """User rows by id: TTL, single-flight loads and invalidation."""
+
+    def test_repeat_lookup_within_ttl_hits_cache(self, service, row, clock):
+        db = FakeDB(row)
+
+        first = asyncio.run(service.get_user_by_id(str(row.id), db))
+        second = asyncio.run(service.get_user_by_id(str(row.id), db))
+
+        assert first.email == second.email == row.email
+        assert db.selects == 1
+
+    def test_lookup_after_ttl_queries_again(self, service, row, clock):
+        db = FakeDB(row)
+
+        asyncio.run(service.get_user_by_id(str(row.id), db))
+        clock.offset += AuthService.USER_CACHE_TTL + 1
+        asyncio.run(service.get_user_by_id(str(row.id), db))
+
+        assert db.selects == 2
+
+    def test_concurrent_misses_share_one_query(self, service, row, clock):
+        db = FakeDB(row, delay=0.01)
+
+        async def lookups():
+            return await asyncio.gather(*(service.get_user_by_id(str(row.id), db) for _ in range(5)))
+
+        users = asyncio.run(lookups())
+
+        assert [u.email for u in users] == [row.email] * 5
+        assert db.selects == 1
+
+    def test_failed_load_releases_waiters(self, service, row, clock):
+        db = FakeDB(row, delay=0.01, error=RuntimeError("db down"))
+
+        async def lookups():
+            return await asyncio.gather(*(service.get_user_by_id(str(row.id), db) for _ in range(3)))
+
+        assert asyncio.run(lookups()) == [None, None, None]
+        assert service._user_loads == {}
+
+        # Nothing was cached, so the next lookup queries again
+        db.error = None
+        assert asyncio.run(service.get_user_by_id(str(row.id), db)).email == row.email
+        assert db.selects == 1
+
+
+class TestTokenCache:
+    """Verified bearer tokens and invalidation on user state changes."""
+
+    def test_token_cache_outlives_user_cache_until_its_ttl(self, service, row, clock):
+        db = FakeDB(row)
+        token = service._create_access_token({"sub": str(row.id), "email": row.email})
+
+        asyncio.run(service.verify_token(token, db))
+        clock.offset += AuthService.USER_CACHE_TTL + 1
+        asyncio.run(service.verify_token(token, db))
+        assert db.selects == 1
+
+        clock.offset += AuthService.TOKEN_CACHE_TTL
+        asyncio.run(service.verify_token(token, db))
+        assert db.selects == 2
+
+    def test_invalid_token_is_rejected(self, service, row, clock):
+        db = FakeDB(row)
+
+        assert asyncio.run(service.verify_token("not.a.jwt", db)) is None
+        assert db.selects == 0
+
+    def test_deactivation_invalidates_cached_token(self, service, row, clock):
+        db = FakeDB(row)
+        token = service._create_access_token({"sub": str(row.id), "email": row.email})
+        assert asyncio.run(service.verify_token(token, db)).is_active
+
+        assert asyncio.run(service.set_user_active(str(row.id), False, db))
+        user = asyncio.run(service.verify_token(token, db))
+
+        assert user.is_active is False
+        assert db.selects == 2
+
+
+@pytest.fixture
+def bcrypt_calls(monkeypatch):
+    """Run password checks inline (no process pool) and count them."""
+    calls = []
+
+    async def run_inline(func, *args):
+        calls.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr(auth_service, "run_cpu_bound", run_inline)
+    return calls
+
+
+def hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+
+
+class TestLoginCache:
+    """Recently verified logins skip bcrypt; failures never do."""
+
+    def test_repeat_login_skips_bcrypt(self, service, clock, bcrypt_calls):
+        stored = hash_password("correct horse")
+
+        assert asyncio.run(service._check_password("a@b.co", "correct horse", stored))
+        assert asyncio.run(service._check_password("a@b.co", "correct horse", stored))
+
+        assert bcrypt_calls == ["verify_password"]
+
+    def test_failed_login_is_never_cached(self, service, clock, bcrypt_calls):
+        stored = hash_password("correct horse")
+
+        for _ in range(3):
+            assert not asyncio.run(service._check_password("a@b.co", "wrong", stored))
+
+        assert bcrypt_calls == ["verify_password"] * 3
+        assert len(service._verified_logins) == 0
+
+    def test_cached_login_expires(self, service, clock, bcrypt_calls):
+        stored = hash_password("correct horse")
+
+        asyncio.run(service._check_password("a@b.co", "correct horse", stored))
+        clock.offset += AuthService.LOGIN_CACHE_TTL + 1
+        asyncio.run(service._check_password("a@b.co", "correct horse", stored))
+
+        assert len(bcrypt_calls) == 2
+
+    def test_changed_password_hash_misses_cache(self, service, clock, bcrypt_calls):
+        old_hash = hash_password("correct horse")
+        new_hash = hash_password("battery staple")
+
+        assert asyncio.run(service._check_password("a@b.co", "correct horse", old_hash))
+        # The old password must not keep working against the new hash
+        assert not asyncio.run(service._check_password("a@b.co", "correct horse", new_hash))
+
+        assert len(bcrypt_calls) == 2
+
+    def test_cache_key_does_not_contain_password(self, service, clock, bcrypt_calls):
+        stored = hash_password("correct horse")
+
+        asyncio.run(service._check_password("a@b.co", "correct horse", stored))
+
+        (key,) = service._verified_logins
+        assert b"correct horse" not in key
+        assert len(key) == 32  # HMAC-SHA256 digest
+
+    def test_login_user_uses_cache_and_rejects_bad_password(self, service, row, clock, bcrypt_calls):
+        row.hashed_password = hash_password("correct horse")
+        db = FakeDB(row)
+
+        good = UserLogin(email=row.email, password="correct horse")
+        first = asyncio.run(service.login_user(good, db))
+        second = asyncio.run(service.login_user(good, db))
+        assert first.user.user_id == second.user.user_id == str(row.id)
+        assert bcrypt_calls == ["verify_password"]
+
+        with pytest.raises(ValueError, match="Invalid email or password"):
+            asyncio.run(service.login_user(UserLogin(email=row.email, password="wrong"), db))
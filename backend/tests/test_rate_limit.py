@@ -0,0 +1,157 @@
+"""
+Tests for the token-bucket rate limiting middleware.
+"""
+
+import asyncio
+import types
+
+import pytest
+
+from app.middleware import rate_limit
+from app.middleware.rate_limit import RateLimitMiddleware
+
+
+class FakeClock:
+    """Stands in for the time module inside the middleware."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(time=fake.time))
+    return fake
+
+
+async def ok_app(scope, receive, send):
+    """Downstream app that always answers 200."""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def request(middleware, ip: str = "10.0.0.1", path: str = "/api/resume/list"):
+    """Send one GET through the middleware; return (status, headers dict)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [],
+        "query_string": b"",
+        "client": (ip, 12345),
+    }
+    asyncio.run(middleware(scope, receive, send))
+    start = messages[0]
+    headers = {k.decode(): v.decode() for k, v in start.get("headers", [])}
+    return start["status"], headers
+
+
+class TestTokenBucket:
+    """Per-IP allow, throttle and refill behaviour."""
+
+    def test_allows_requests_under_limit(self, clock):
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=5, requests_per_hour=100)
+
+        status, headers = request(middleware)
+
+        assert status == 200
+        assert headers["x-ratelimit-limit-minute"] == "5"
+        assert headers["x-ratelimit-remaining-minute"] == "4"
+        assert headers["x-ratelimit-limit-hour"] == "100"
+        assert headers["x-ratelimit-remaining-hour"] == "99"
+
+    def test_throttles_after_minute_limit(self, clock):
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=3, requests_per_hour=100)
+
+        statuses = [request(middleware)[0] for _ in range(4)]
+
+        assert statuses == [200, 200, 200, 429]
+
+    def test_limits_are_per_ip(self, clock):
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=1, requests_per_hour=100)
+
+        assert request(middleware, ip="10.0.0.1")[0] == 200
+        assert request(middleware, ip="10.0.0.1")[0] == 429
+        assert request(middleware, ip="10.0.0.2")[0] == 200
+
+    def test_bucket_refills_over_window(self, clock):
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=2, requests_per_hour=100)
+        request(middleware)
+        request(middleware)
+        assert request(middleware)[0] == 429
+
+        # Half a window refills half the bucket
+        clock.now += 30
+        assert request(middleware)[0] == 200
+        assert request(middleware)[0] == 429
+
+        # A full window refills it completely, but never above the limit
+        clock.now += 600
+        statuses = [request(middleware)[0] for _ in range(3)]
+        assert statuses == [200, 200, 429]
+
+    def test_health_paths_are_not_limited(self, clock):
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=1, requests_per_hour=100)
+
+        statuses = [request(middleware, path="/health")[0] for _ in range(3)]
+
+        assert statuses == [200, 200, 200]
+
+
+class TestLimitsAndEviction:
+    """Hour limit and bounded per-IP state."""
+
+    def test_hour_limit_applies_when_minute_bucket_refills(self, clock):
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=2, requests_per_hour=3)
+
+        statuses = []
+        for _ in range(4):
+            statuses.append(request(middleware)[0])
+            clock.now += 60  # minute bucket is full again every time
+
+        assert statuses == [200, 200, 200, 429]
+
+    def test_state_is_bounded_by_max_entries(self, clock, monkeypatch):
+        monkeypatch.setattr(RateLimitMiddleware, "NUM_SHARDS", 1)
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=1, requests_per_hour=100, max_entries=2)
+
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            request(middleware, ip=ip)
+
+        shard = middleware.shards[0]
+        assert list(shard) == ["10.0.0.2", "10.0.0.3"]
+        # The evicted IP starts over with a full bucket
+        assert request(middleware, ip="10.0.0.1")[0] == 200
+
+    def test_recent_use_protects_from_eviction(self, clock, monkeypatch):
+        monkeypatch.setattr(RateLimitMiddleware, "NUM_SHARDS", 1)
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=5, requests_per_hour=100, max_entries=2)
+
+        request(middleware, ip="10.0.0.1")
+        request(middleware, ip="10.0.0.2")
+        request(middleware, ip="10.0.0.1")  # now most recently used
+        request(middleware, ip="10.0.0.3")
+
+        assert list(middleware.shards[0]) == ["10.0.0.1", "10.0.0.3"]
+
+    def test_idle_buckets_are_dropped(self, clock, monkeypatch):
+        monkeypatch.setattr(RateLimitMiddleware, "NUM_SHARDS", 1)
+        middleware = RateLimitMiddleware(ok_app, requests_per_minute=5, requests_per_hour=100)
+
+        request(middleware, ip="10.0.0.1")
+        clock.now += RateLimitMiddleware.IDLE_TTL + 1
+        request(middleware, ip="10.0.0.2")
+
+        assert list(middleware.shards[0]) == ["10.0.0.2"]
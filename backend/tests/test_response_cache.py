@@ -0,0 +1,102 @@
+"""
+Tests for the cached() route decorator.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.services import response_cache
+from app.services.response_cache import ResponseCache, cached
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    """Fresh in-memory cache per test."""
+    cache = ResponseCache(redis_url=None, default_ttl=60)
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    return cache
+
+
+def make_client(results):
+    """App with one cached route returning (or raising) ``results`` in order."""
+    app = FastAPI()
+    calls = []
+
+    @app.get("/stats")
+    @cached(namespace="test")
+    async def stats(department: str = "all"):
+        calls.append(department)
+        result = results[min(len(calls), len(results)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return TestClient(app), calls
+
+
+class TestCachedRoute:
+    """Cache hits, ETag revalidation and what never gets cached."""
+
+    def test_second_request_is_served_from_cache(self):
+        client, calls = make_client([{"total": 1}, {"total": 2}])
+
+        first = client.get("/stats")
+        second = client.get("/stats")
+
+        assert first.json() == second.json() == {"total": 1}
+        assert calls == ["all"]
+
+    def test_query_params_are_part_of_the_key(self):
+        client, calls = make_client([{"total": 1}])
+
+        client.get("/stats", params={"department": "CS"})
+        client.get("/stats", params={"department": "IT"})
+
+        assert calls == ["CS", "IT"]
+
+    def test_matching_etag_gets_304(self):
+        client, _ = make_client([{"total": 1}])
+
+        first = client.get("/stats")
+        etag = first.headers["etag"]
+        revalidated = client.get("/stats", headers={"If-None-Match": etag})
+        changed = client.get("/stats", headers={"If-None-Match": 'W/"stale"'})
+
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "no-cache"
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+        assert changed.status_code == 200
+        assert changed.json() == {"total": 1}
+
+    def test_empty_result_is_not_cached(self):
+        # Services return {} when they fail
+        client, calls = make_client([{}, {"total": 1}])
+
+        assert client.get("/stats").json() == {}
+        assert client.get("/stats").json() == {"total": 1}
+        assert client.get("/stats").json() == {"total": 1}
+        assert len(calls) == 2
+
+    def test_error_is_not_cached(self):
+        client, calls = make_client([HTTPException(status_code=500, detail="db down"), {"total": 1}])
+
+        assert client.get("/stats").status_code == 500
+        second = client.get("/stats")
+
+        assert second.status_code == 200
+        assert second.json() == {"total": 1}
+        assert len(calls) == 2
+
+    def test_clear_invalidates_namespace(self, memory_cache):
+        client, calls = make_client([{"total": 1}, {"total": 2}])
+
+        client.get("/stats")
+        asyncio.run(memory_cache.clear("test"))
+
+        assert client.get("/stats").json() == {"total": 2}
+        assert len(calls) == 2